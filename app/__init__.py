@@ -4,26 +4,34 @@ from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_cors import CORS
-# from flask_jwt_extended import JWTManager  # COMMENT OUT FOR NOW
-from datetime import timedelta
+from flask_jwt_extended import JWTManager
+from sqlalchemy.engine import make_url
+from app.cache import ResponseCache
+from app.json_provider import FastJSONProvider
+from app.config import load_config
 
 # Initialize extensions
 db = SQLAlchemy()
 migrate = Migrate()
-# jwt = JWTManager()  # COMMENT OUT FOR NOW
+cache = ResponseCache()
+jwt = JWTManager()
 
-def create_app():
+def create_app(profile=None):
+    """Build the app. Does no database I/O, so it is safe to preload in gunicorn.
+
+    Create the schema with `flask db upgrade` and load
+    sample data with `flask seed`.
+    """
     app = Flask(__name__)
+    app.json = FastJSONProvider(app)
     
-    # Configuration
-    if os.environ.get('DATABASE_URL'):
-        app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL').replace('postgres://', 'postgresql://')
-    else:
-        app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///knowledge_base.db'
+    # Configuration: one profile object, overridable through the environment
+    app.config.from_object(load_config(profile))
     
-    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-    # app.config['JWT_SECRET_KEY'] = os.environ.get('JWT_SECRET_KEY', 'your-secret-key')  # COMMENT OUT
-    # app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(hours=24)  # COMMENT OUT
+    # SQLite needs its directory to exist before the first connection
+    database_url = make_url(app.config['SQLALCHEMY_DATABASE_URI'])
+    if database_url.get_backend_name() == 'sqlite' and database_url.database not in (None, '', ':memory:'):
+        os.makedirs(os.path.dirname(database_url.database), exist_ok=True)
     
     # ✅ CORS Configuration
     CORS(app, resources={
@@ -43,8 +51,26 @@ def create_app():
     
     # Initialize extensions
     db.init_app(app)
+    with app.app_context():
+        from app.db_pool import init_engine
+        init_engine(app, db.engine)
+        if app.config['METRICS_ENABLED']:
+            from app.metrics import Metrics
+            Metrics().init_app(app, db.engine)
     migrate.init_app(app, db)
-    # jwt.init_app(app)  # COMMENT OUT
+    cache.init_app(app)
+    
+    # Per-app, as it holds this worker's prefix index
+    from app.suggest import Suggestions
+    Suggestions().init_app(app)
+    
+    # Per-app; its limits are shared by all workers through lock files
+    from app.passwords import PasswordHasher
+    PasswordHasher().init_app(app)
+    
+    jwt.init_app(app)
+    from app.auth import PrincipalCache
+    PrincipalCache().init_app(app)
     
     # Register blueprints
     from app.routes.articles import articles_bp
@@ -53,6 +79,7 @@ def create_app():
     from app.routes.users import users_bp
     from app.routes.feedback import feedback_bp
     from app.routes.main import main_bp
+    from app.routes.suggest import suggest_bp
     
     app.register_blueprint(articles_bp)
     app.register_blueprint(categories_bp)
@@ -60,5 +87,10 @@ def create_app():
     app.register_blueprint(users_bp)
     app.register_blueprint(feedback_bp)
     app.register_blueprint(main_bp)
+    app.register_blueprint(suggest_bp)
+    
+    # CLI commands
+    from app.cli import register_commands
+    register_commands(app)
     
     return app
\ No newline at end of file
@@ -0,0 +1,72 @@
+# app/auth.py
+# JWT access tokens and the per-worker principal cache.
+#
+# Tokens carry the user id as identity plus "username" and "role" claims, so
+# routes that only need who is calling and with which role read get_jwt()
+# and never touch the users table. Routes that need the full profile use
+# principals().get(user_id): a short-TTL in-process cache in front of one
+# narrow SELECT.
+#
+# update_user and Firebase linking invalidate the entry in the worker that
+# handled the write; other workers see the change within
+# PRINCIPAL_CACHE_TTL seconds. Claims in tokens already issued keep their
+# values until the token expires.
+from flask import current_app
+from flask_jwt_extended import create_access_token
+
+from app import db
+from app.cache import MemoryBackend
+from app.models import User
+
+PRINCIPAL_COLUMNS = (User.id, User.username, User.email, User.role, User.firebase_uid)
+
+
+def access_token_for(user_id, username, role):
+    """Access token identifying `user_id`, with username and role embedded as claims."""
+    return create_access_token(
+        identity=str(user_id),
+        additional_claims={'username': username, 'role': role}
+    )
+
+
+def principals():
+    """The current app's PrincipalCache extension."""
+    return current_app.extensions['principals']
+
+
+def principal_tag(user_id):
+    return f'user:{user_id}'
+
+
+class PrincipalCache:
+    """User id -> profile dict, cached per worker for PRINCIPAL_CACHE_TTL seconds."""
+
+    def __init__(self):
+        self.ttl = 60
+        self.backend = MemoryBackend()
+
+    def init_app(self, app):
+        self.ttl = app.config.get('PRINCIPAL_CACHE_TTL', self.ttl)
+        self.backend = MemoryBackend(app.config.get('PRINCIPAL_CACHE_MAX_ENTRIES', 10000))
+        app.extensions['principals'] = self
+
+    def get(self, user_id):
+        """Profile dict for `user_id` (id, username, email, role, firebase_uid), or None."""
+        user_id = int(user_id)
+        principal = self.backend.get(user_id) if self.ttl else None
+        if principal is None:
+            row = db.session.execute(
+                db.select(*PRINCIPAL_COLUMNS).where(User.id == user_id)
+            ).mappings().first()
+            if row is None:
+                return None
+            principal = dict(row)
+            if self.ttl:
+                self.backend.set(user_id, principal, self.ttl, (principal_tag(user_id),))
+        return principal
+
+    def invalidate(self, user_id):
+        self.backend.invalidate([principal_tag(int(user_id))])
+
+    def stats(self):
+        return {'ttl_seconds': self.ttl, **self.backend.stats()}
@@ -0,0 +1,281 @@
+# app/bench.py
+# Endpoint benchmark: drives every route through the Flask test client and
+# reports latency percentiles, throughput and SQL statements per request.
+#
+# Requests run sequentially in-process with the response cache disabled, so
+# the numbers measure route, ORM and database cost, not HTTP or caching.
+# Listing routes run once per requested per_page; write routes run as
+# create/update/feedback/delete cycles that leave the data as they found it
+# (apart from id sequences).
+#
+# Results are plain JSON. Latency varies between machines, but statement
+# counts do not: compare_results() flags any route whose query count grew,
+# or whose p50 grew beyond a tolerance, relative to a baseline run on the
+# same machine.
+import platform
+import random
+import subprocess
+import time
+from collections import namedtuple
+from datetime import datetime, timezone
+
+from app import cache, db
+from app.config import PROJECT_ROOT
+from app.datagen import PASSWORD, WORDS
+from app.models import Article, Category, Feedback, Tag, User
+from app.queries import count_statements
+from app.suggest import suggestions
+
+DEFAULT_REQUESTS = 50
+DEFAULT_WARMUP = 5
+DEFAULT_PER_PAGE = (10, 50)
+SAMPLE_SIZE = 500
+
+# Absolute p50 slack so sub-millisecond routes do not flag on noise
+LATENCY_SLACK_MS = 0.5
+
+# `paged` routes take {per_page}; `body` builds the JSON payload; `capture`
+# names the value a write step stores for the steps after it
+Route = namedtuple('Route', 'name method url paged body capture', defaults=(False, None, None))
+
+READ_ROUTES = [
+    Route('home', 'GET', '/'),
+    Route('articles.list', 'GET', '/articles?per_page={per_page}', paged=True),
+    Route('articles.list_cursor', 'GET', '/articles?cursor=&per_page={per_page}', paged=True),
+    Route('articles.list_category', 'GET', '/articles?category_id={category_id}&per_page={per_page}', paged=True),
+    Route('articles.list_author', 'GET', '/articles?author_id={user_id}&per_page={per_page}', paged=True),
+    Route('articles.list_tag', 'GET', '/articles?tag_id={tag_id}&per_page={per_page}', paged=True),
+    Route('articles.search', 'GET', '/articles?search={word}&per_page={per_page}', paged=True),
+    Route('articles.fields', 'GET', '/articles?fields=id,title&per_page={per_page}', paged=True),
+    Route('articles.detail', 'GET', '/articles/{article_id}'),
+    Route('articles.by_tag', 'GET', '/articles/tag/{tag_name}?per_page={per_page}', paged=True),
+    Route('articles.related', 'GET', '/articles/{article_id}/related'),
+    Route('articles.export', 'GET', '/articles/export'),
+    Route('feedback.list', 'GET', '/articles/{article_id}/feedback?per_page={per_page}', paged=True),
+    Route('feedback.summary', 'GET', '/articles/{article_id}/feedback/summary'),
+    Route('feedback.batch_summary', 'GET', '/feedback/summary?article_ids={article_ids}'),
+    Route('feedback.by_user', 'GET', '/users/{voter_id}/feedback?per_page={per_page}', paged=True),
+    Route('users.list', 'GET', '/users'),
+    Route('users.detail', 'GET', '/users/{user_id}'),
+    Route('users.login', 'POST', '/login',
+          body=lambda values: {'username': values['username'], 'password': PASSWORD}),
+    Route('categories.list', 'GET', '/categories'),
+    Route('tags.list', 'GET', '/tags'),
+    Route('suggest', 'GET', '/suggest?q={prefix}'),
+]
+
+WRITE_ROUTES = [
+    Route('articles.create', 'POST', '/articles',
+          body=lambda values: {
+              'title': f"Benchmark {values['word']}",
+              'content': f"{values['word']} " * 300,
+              'author_id': values['user_id'],
+              'category_id': values['category_id'],
+              'tag_ids': [values['tag_id']],
+          },
+          capture=('new_article_id', lambda data: data['article']['id'])),
+    Route('articles.update', 'PUT', '/articles/{new_article_id}',
+          body=lambda values: {'title': f"Benchmark {values['word']} (edited)", 'tag_ids': []}),
+    Route('feedback.create', 'POST', '/articles/{new_article_id}/feedback',
+          body=lambda values: {'helpfulness_score': 4, 'user_id': values['user_id']},
+          capture=('new_feedback_id', lambda data: data['feedback_id'])),
+    Route('feedback.delete', 'DELETE', '/feedback/{new_feedback_id}'),
+    Route('articles.delete', 'DELETE', '/articles/{new_article_id}'),
+]
+
+
+class Sampler:
+    """Random existing ids and names to fill in route URLs."""
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.pools = {
+            'article_id': sample_column(Article.id, rng),
+            'user_id': sample_column(User.id, rng),
+            'category_id': sample_column(Category.id, rng),
+            'tag_id': sample_column(Tag.id, rng),
+            'tag_name': sample_column(Tag.name, rng),
+            'username': sample_column(User.username, rng),
+        }
+        # Users who left feedback, for the per-user feedback listing
+        self.pools['voter_id'] = sample_column(Feedback.user_id, rng) or self.pools['user_id']
+        missing = [name for name, pool in self.pools.items() if not pool]
+        if missing:
+            raise ValueError(f"Nothing to benchmark: no rows for {', '.join(missing)}")
+
+    def values(self, **extra):
+        rng = self.rng
+        values = {name: rng.choice(pool) for name, pool in self.pools.items()}
+        word = rng.choice(WORDS)
+        values.update(
+            word=word,
+            prefix=word[:3],
+            article_ids=','.join(str(rng.choice(self.pools['article_id'])) for _ in range(10)),
+            **extra
+        )
+        return values
+
+
+def sample_column(column, rng, size=SAMPLE_SIZE):
+    """Up to `size` distinct non-null values of `column`, without a full-table sort."""
+    table = column.class_
+    max_id = db.session.execute(db.select(db.func.max(table.id))).scalar()
+    if max_id is None:
+        return []
+    ids = {rng.randint(1, max_id) for _ in range(size * 2)}
+    values = db.session.execute(
+        db.select(column).where(table.id.in_(sorted(ids)), column.isnot(None)).order_by(table.id)
+    ).scalars().all()
+    return values[:size]
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def summarize(route, per_page, timings, queries, sizes, errors):
+    timings.sort()
+    total = sum(timings)
+    return {
+        'route': route.name,
+        'method': route.method,
+        'per_page': per_page,
+        'requests': len(timings),
+        'errors': errors,
+        'throughput_rps': round(len(timings) / total, 1) if total else None,
+        'p50_ms': round(percentile(timings, 0.5) * 1000, 3),
+        'p99_ms': round(percentile(timings, 0.99) * 1000, 3),
+        'mean_ms': round(total / len(timings) * 1000, 3),
+        'queries_p50': percentile(sorted(queries), 0.5),
+        'queries_max': max(queries),
+        'response_bytes_p50': percentile(sorted(sizes), 0.5),
+    }
+
+
+class Benchmark:
+    def __init__(self, app, requests=DEFAULT_REQUESTS, warmup=DEFAULT_WARMUP, seed=0, routes=None):
+        self.app = app
+        self.client = app.test_client()
+        self.requests = requests
+        self.warmup = warmup
+        self.rng = random.Random(seed)
+        self.routes = set(routes) if routes else None
+
+    def selected(self, routes):
+        return [route for route in routes if self.routes is None or route.name in self.routes]
+
+    def call(self, route, values):
+        """Run one request; returns (seconds, statements, body bytes, response)."""
+        url = route.url.format(**values)
+        body = route.body(values) if route.body else None
+        # Requests share the benchmark's app context; give each a fresh
+        # session like a real request gets
+        db.session.remove()
+        with count_statements() as statements:
+            started = time.perf_counter()
+            response = self.client.open(url, method=route.method, json=body)
+            data = response.get_data()  # drains streamed bodies
+            elapsed = time.perf_counter() - started
+        response.close()
+        return elapsed, len(statements), len(data), response
+
+    def run_route(self, route, sampler, per_page=None):
+        timings, queries, sizes, errors = [], [], [], 0
+        for iteration in range(self.warmup + self.requests):
+            elapsed, statements, size, response = self.call(route, sampler.values(per_page=per_page))
+            if iteration < self.warmup:
+                continue
+            timings.append(elapsed)
+            queries.append(statements)
+            sizes.append(size)
+            errors += response.status_code >= 400
+        return summarize(route, per_page, timings, queries, sizes, errors)
+
+    def run_writes(self, sampler):
+        routes = self.selected(WRITE_ROUTES)
+        samples = {route.name: ([], [], [], 0) for route in routes}
+        for iteration in range(self.warmup + self.requests):
+            values = sampler.values()
+            for route in WRITE_ROUTES:
+                elapsed, statements, size, response = self.call(route, values)
+                if route.capture:
+                    name, extract = route.capture
+                    values[name] = extract(response.get_json())
+                if iteration < self.warmup or route.name not in samples:
+                    continue
+                timings, queries, sizes, errors = samples[route.name]
+                timings.append(elapsed)
+                queries.append(statements)
+                sizes.append(size)
+                samples[route.name] = (timings, queries, sizes, errors + (response.status_code >= 400))
+        return [summarize(route, None, *samples[route.name]) for route in routes]
+
+    def run(self, per_page_values=DEFAULT_PER_PAGE):
+        """Benchmark the current database; returns a list of per-route results."""
+        with self.app.app_context():
+            cache_enabled, cache.enabled = cache.enabled, False
+            try:
+                suggestions().expire()
+                sampler = Sampler(self.rng)
+                db.session.rollback()
+                results = []
+                for route in self.selected(READ_ROUTES):
+                    for per_page in (per_page_values if route.paged else (None,)):
+                        results.append(self.run_route(route, sampler, per_page))
+                results.extend(self.run_writes(sampler))
+                return results
+            finally:
+                cache.enabled = cache_enabled
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_ROOT,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_metadata(app, **settings):
+    with app.app_context():
+        dialect = db.engine.dialect.name
+    return {
+        'commit': git_commit(),
+        'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'dialect': dialect,
+        **settings,
+    }
+
+
+def result_key(result):
+    return result.get('scale'), result['route'], result['per_page']
+
+
+def compare_results(baseline, current, tolerance):
+    """Regressions of `current` against `baseline` (both benchmark result lists).
+
+    A route regresses when it issues more statements than before, or when
+    its p50 exceeds the baseline p50 times `tolerance` (plus a small
+    absolute slack). Routes missing from the baseline are skipped.
+    """
+    previous = {result_key(result): result for result in baseline}
+    regressions = []
+    for result in current:
+        before = previous.get(result_key(result))
+        if before is None:
+            continue
+        if result['queries_max'] > before['queries_max']:
+            regressions.append({
+                **dict(zip(('scale', 'route', 'per_page'), result_key(result))),
+                'metric': 'queries_max', 'baseline': before['queries_max'], 'current': result['queries_max'],
+            })
+        if result['p50_ms'] > before['p50_ms'] * tolerance + LATENCY_SLACK_MS:
+            regressions.append({
+                **dict(zip(('scale', 'route', 'per_page'), result_key(result))),
+                'metric': 'p50_ms', 'baseline': before['p50_ms'], 'current': result['p50_ms'],
+            })
+    return regressions
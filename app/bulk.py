@@ -0,0 +1,247 @@
+# app/bulk.py
+# Bulk article import and export as NDJSON (one JSON object per line).
+#
+# Import reads lines lazily, resolves authors/categories/tags by name with
+# one IN query per chunk (results are remembered across chunks), and writes
+# each chunk with two executemany INSERTs: articles, then article_tags.
+# Every chunk is its own transaction; bad rows are reported, not fatal.
+#
+# Import line format:
+#   {"title": "...", "content": "...", "author": "alice_dev",
+#    "category": "Engineering", "tags": ["api", "guide"]}
+# "author_id" / "category_id" (integers) may be given instead of names.
+# Unknown tags are created; unknown authors and categories, and fields of
+# the wrong JSON type, are row errors.
+import json
+
+from sqlalchemy import insert
+
+from app import db
+from app.models import Article, ArticleTag, Category, Tag, User
+from app.streaming import closing_rows, streaming_session
+
+DEFAULT_CHUNK_SIZE = 500
+EXPORT_BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+
+STRING_FIELDS = ('title', 'content', 'author', 'category')
+ID_FIELDS = ('author_id', 'category_id')
+
+
+class NameResolver:
+    """Maps a unique column (a name, or the id itself) to ids for one model.
+
+    Unknown keys are looked up in batches; results are remembered.
+    """
+
+    def __init__(self, model, name_column):
+        self.model = model
+        self.name_column = name_column
+        self.ids = {}
+
+    def load(self, names):
+        missing = {name for name in names if name not in self.ids}
+        if missing:
+            rows = db.session.query(self.name_column, self.model.id)\
+                             .filter(self.name_column.in_(missing))\
+                             .all()
+            self.ids.update(rows)
+
+    def get(self, name):
+        return self.ids.get(name)
+
+
+def parse_lines(lines):
+    """Yield (line_number, row, error) for each non-blank NDJSON line."""
+    for number, line in enumerate(lines, start=1):
+        if isinstance(line, bytes):
+            line = line.decode('utf-8')
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield number, None, f'Invalid JSON: {e}'
+            continue
+        if not isinstance(row, dict):
+            yield number, None, 'Each line must be a JSON object'
+            continue
+        yield number, row, None
+
+
+def row_error(row):
+    """Message for the first field of `row` with the wrong type, or None."""
+    for field in STRING_FIELDS:
+        if row.get(field) is not None and not isinstance(row[field], str):
+            return f'{field} must be a string'
+    for field in ID_FIELDS:
+        value = row.get(field)
+        # bool is an int subclass, but true is not an id
+        if value is not None and (not isinstance(value, int) or isinstance(value, bool)):
+            return f'{field} must be an integer'
+    names = row.get('tags')
+    if names is not None and not (
+        isinstance(names, list) and all(isinstance(name, str) and name for name in names)
+    ):
+        return 'tags must be a list of tag names'
+    return None
+
+
+def chunked(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def import_articles(lines, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Import NDJSON article lines; returns a summary dict.
+
+    The summary holds imported/failed counts, per-row errors (capped at
+    MAX_REPORTED_ERRORS) and the ids of touched categories and tags so
+    callers can invalidate caches.
+    """
+    authors = NameResolver(User, User.username)
+    author_ids = NameResolver(User, User.id)
+    categories = NameResolver(Category, Category.name)
+    category_ids = NameResolver(Category, Category.id)
+    tags = NameResolver(Tag, Tag.name)
+
+    summary = {'imported': 0, 'failed': 0, 'errors': [], 'category_ids': set(), 'tag_ids': set()}
+
+    def fail(number, message):
+        summary['failed'] += 1
+        if len(summary['errors']) < MAX_REPORTED_ERRORS:
+            summary['errors'].append({'line': number, 'error': message})
+
+    for chunk in chunked(parse_lines(lines), chunk_size):
+        rows = []
+        for number, row, error in chunk:
+            error = error or row_error(row)
+            if error:
+                fail(number, error)
+            else:
+                rows.append((number, row))
+
+        # Batched name lookups for the whole chunk; values are type-checked above
+        authors.load({row['author'] for _, row in rows if row.get('author') is not None})
+        author_ids.load({row['author_id'] for _, row in rows if row.get('author_id') is not None})
+        categories.load({row['category'] for _, row in rows if row.get('category') is not None})
+        category_ids.load({row['category_id'] for _, row in rows if row.get('category_id') is not None})
+        tags.load({name for _, row in rows for name in row.get('tags') or []})
+
+        article_rows = []
+        article_numbers = []
+        article_tag_names = []
+        for number, row in rows:
+            if not row.get('title') or not row.get('content'):
+                fail(number, 'Title and content are required')
+                continue
+            author_id = author_ids.get(row.get('author_id')) or authors.get(row.get('author'))
+            if not author_id:
+                fail(number, f"Author not found: {row.get('author', row.get('author_id'))}")
+                continue
+            category_id = category_ids.get(row.get('category_id')) or categories.get(row.get('category'))
+            if not category_id:
+                fail(number, f"Category not found: {row.get('category', row.get('category_id'))}")
+                continue
+            article_rows.append({
+                'title': row['title'],
+                'content': row['content'],
+                'author_id': author_id,
+                'category_id': category_id
+            })
+            article_numbers.append(number)
+            article_tag_names.append(row.get('tags') or [])
+
+        if not article_rows:
+            continue
+
+        new_tags = {name for names in article_tag_names for name in names if tags.get(name) is None}
+        try:
+            if new_tags:
+                db.session.execute(insert(Tag), [{'name': name} for name in new_tags])
+                tags.load(new_tags)
+
+            article_ids = db.session.execute(
+                insert(Article).returning(Article.id, sort_by_parameter_order=True),
+                article_rows
+            ).scalars().all()
+
+            links = [
+                {'article_id': article_id, 'tag_id': tags.get(name)}
+                for article_id, names in zip(article_ids, article_tag_names)
+                for name in dict.fromkeys(names)
+            ]
+            if links:
+                db.session.execute(insert(ArticleTag), links)
+            db.session.commit()
+        except Exception as e:
+            # e.g. a concurrent writer created one of the new tags; fail the chunk
+            db.session.rollback()
+            for name in new_tags:
+                tags.ids.pop(name, None)
+            for number in article_numbers:
+                fail(number, f'Chunk rejected: {e.__class__.__name__}')
+            continue
+
+        summary['imported'] += len(article_rows)
+        summary['category_ids'].update(row['category_id'] for row in article_rows)
+        summary['tag_ids'].update(link['tag_id'] for link in links)
+
+    return summary
+
+
+def export_articles(batch_size=EXPORT_BATCH_SIZE):
+    """Iterator of one dict per article, oldest first, in constant memory.
+
+    The article query runs before this returns, so its errors reach the
+    caller rather than the first read of a streamed response. Rows are
+    then fetched with yield_per on a streaming session; tags with one query
+    per batch. Items use the same format import_articles() accepts.
+    """
+    session = streaming_session()
+    try:
+        result = session.execute(
+            db.select(
+                Article.id, Article.title, Article.content,
+                User.username, Category.name,
+                Article.created_at, Article.updated_at
+            )
+            .join(User, User.id == Article.author_id)
+            .join(Category, Category.id == Article.category_id)
+            .order_by(Article.id)
+            .execution_options(yield_per=batch_size)
+        )
+    except Exception:
+        session.close()
+        raise
+    return closing_rows(export_items(result, session), session)
+
+
+def export_items(result, session):
+    for batch in result.partitions():
+        ids = [row.id for row in batch]
+        tag_names = {}
+        for article_id, name in session.execute(
+            db.select(ArticleTag.article_id, Tag.name)
+            .join(Tag, Tag.id == ArticleTag.tag_id)
+            .where(ArticleTag.article_id.in_(ids))
+        ):
+            tag_names.setdefault(article_id, []).append(name)
+
+        for row in batch:
+            yield {
+                'id': row.id,
+                'title': row.title,
+                'content': row.content,
+                'author': row.username,
+                'category': row.name,
+                'tags': tag_names.get(row.id, []),
+                'created_at': row.created_at,
+                'updated_at': row.updated_at
+            }
@@ -0,0 +1,247 @@
+# app/cache.py
+# Response cache for read endpoints with tag-based invalidation.
+#
+# Cached responses are keyed on path + normalized query string and labelled
+# with dependency tags such as "article:12", "category:3" or "tag:7". Write
+# routes call cache.invalidate(...) with the tags they touched, which drops
+# exactly the entries that depended on them.
+#
+# Backends:
+#   memory - in-process LRU with TTL (default). Each gunicorn worker has its
+#            own copy, so invalidation is per-worker; keep the TTL short.
+#   redis  - shared across workers. RedisBackend only uses get/set/delete/
+#            sadd/smembers/expire, so any client exposing those works.
+import json
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from urllib.parse import urlencode
+
+from flask import current_app, g, request
+
+
+class MemoryBackend:
+    """In-process LRU cache with per-entry TTL and a tag index."""
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # key -> (expires_at, value, tags)
+        self.tag_index = {}           # tag -> set of keys
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value, ttl, tags=()):
+        with self.lock:
+            if key in self.entries:
+                self._remove(key)
+            self.entries[key] = (time.monotonic() + ttl, value, tuple(tags))
+            for tag in tags:
+                self.tag_index.setdefault(tag, set()).add(key)
+            while len(self.entries) > self.max_entries:
+                oldest = next(iter(self.entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate(self, tags):
+        with self.lock:
+            for tag in tags:
+                for key in self.tag_index.pop(tag, ()):
+                    self._remove(key)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.tag_index.clear()
+
+    def stats(self):
+        return {
+            'backend': 'memory',
+            'entries': len(self.entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions
+        }
+
+    def _remove(self, key):
+        # Caller holds the lock
+        _, _, tags = self.entries.pop(key)
+        for tag in tags:
+            keys = self.tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.tag_index[tag]
+
+
+class RedisBackend:
+    """Shared cache on a Redis-compatible client.
+
+    Each tag is a set of cache keys; invalidating a tag deletes its members.
+    Tag sets expire with the longest-lived entry they reference. Eviction is
+    left to Redis (maxmemory policy), so the evictions counter stays at 0.
+    """
+
+    def __init__(self, client, prefix='kb:cache:'):
+        self.client = client
+        self.prefix = prefix
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(raw)
+
+    def set(self, key, value, ttl, tags=()):
+        self.client.set(self.prefix + key, json.dumps(value), ex=ttl)
+        for tag in tags:
+            tag_key = self.prefix + 'tag:' + tag
+            self.client.sadd(tag_key, key)
+            self.client.expire(tag_key, ttl)
+
+    def invalidate(self, tags):
+        for tag in tags:
+            tag_key = self.prefix + 'tag:' + tag
+            keys = self.client.smembers(tag_key)
+            if keys:
+                self.client.delete(*[self.prefix + _text(k) for k in keys])
+            self.client.delete(tag_key)
+
+    def clear(self):
+        # Entries expire on their own; clearing is not supported on a shared store
+        pass
+
+    def stats(self):
+        return {
+            'backend': 'redis',
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': 0
+        }
+
+
+def _text(value):
+    return value.decode() if isinstance(value, bytes) else value
+
+
+class ResponseCache:
+    """Flask extension wiring a cache backend into the app."""
+
+    def __init__(self):
+        self.backend = None
+        self.default_ttl = 60
+        self.max_streamed_bytes = 1024 * 1024
+        self.enabled = True
+
+    def init_app(self, app, backend=None):
+        self.enabled = app.config.get('CACHE_ENABLED', True)
+        self.default_ttl = app.config.get('CACHE_DEFAULT_TTL', 60)
+        self.max_streamed_bytes = app.config.get('CACHE_MAX_STREAMED_BYTES', self.max_streamed_bytes)
+
+        if backend is None:
+            if app.config.get('CACHE_BACKEND', 'memory') == 'redis':
+                import redis  # optional dependency, only needed for this backend
+                backend = RedisBackend(redis.Redis.from_url(app.config['CACHE_REDIS_URL']))
+            else:
+                backend = MemoryBackend(app.config.get('CACHE_MAX_ENTRIES', 1024))
+        self.backend = backend
+        app.extensions['response_cache'] = self
+
+    def invalidate(self, *tags):
+        if self.enabled and tags:
+            self.backend.invalidate(tags)
+
+    def stats(self):
+        return self.backend.stats()
+
+
+def cache_key():
+    """Path plus query args sorted by name, so ?a=1&b=2 and ?b=2&a=1 share an entry."""
+    args = sorted(request.args.items(multi=True))
+    return f'{request.path}?{urlencode(args)}'
+
+
+def add_cache_tags(*tags):
+    """Attach extra dependency tags to the response being cached."""
+    if 'cache_tags' in g:
+        g.cache_tags.update(tags)
+
+
+def cache_streamed(cache, chunks, key, entry, ttl, tags):
+    """Pass a streamed body through, storing it once fully sent.
+
+    Bodies larger than cache.max_streamed_bytes are not stored, so caching
+    never makes a streamed response buffer without bound. `tags` is the
+    request's tag set; views keep adding to it while the body streams.
+    """
+    parts = []
+    size = 0
+    for chunk in chunks:
+        if parts is not None:
+            size += len(chunk)
+            parts.append(chunk)
+            if size > cache.max_streamed_bytes:
+                parts = None
+        yield chunk
+
+    if parts is not None:
+        body = b''.join(part if isinstance(part, bytes) else part.encode() for part in parts)
+        cache.backend.set(key, {**entry, 'body': body.decode()}, ttl, tags)
+
+
+def cached(*tags, ttl=None):
+    """Cache successful GET responses of a view.
+
+    `tags` may reference view arguments, e.g. 'article:{article_id}'. Views
+    can add data-dependent tags while running via add_cache_tags().
+    Streamed responses are stored after the last chunk is sent.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            cache = current_app.extensions['response_cache']
+            if not cache.enabled or request.method != 'GET':
+                return view(*args, **kwargs)
+
+            key = cache_key()
+            hit = cache.backend.get(key)
+            if hit is not None:
+                response = current_app.response_class(
+                    hit['body'], status=hit['status'], mimetype=hit['mimetype']
+                )
+                response.headers['X-Cache'] = 'HIT'
+                return response
+
+            g.cache_tags = {tag.format(**kwargs) for tag in tags}
+            response = current_app.make_response(view(*args, **kwargs))
+            if response.status_code == 200:
+                entry = {'status': response.status_code, 'mimetype': response.mimetype}
+                if response.is_streamed:
+                    response.response = cache_streamed(
+                        cache, response.response, key, entry, ttl or cache.default_ttl, g.cache_tags
+                    )
+                else:
+                    entry['body'] = response.get_data(as_text=True)
+                    cache.backend.set(key, entry, ttl or cache.default_ttl, g.cache_tags)
+            response.headers['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
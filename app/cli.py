@@ -0,0 +1,308 @@
+# app/cli.py
+# Maintenance commands, available as `flask <group> <command>`.
+import json
+import random
+import time
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+feedback_cli = AppGroup('feedback', help='Feedback maintenance commands.')
+articles_cli = AppGroup('articles', help='Article import and export.')
+perf_cli = AppGroup('perf', help='Query performance checks.')
+
+
+@feedback_cli.command('rebuild-stats')
+@click.option('--batch-size', default=1000, show_default=True,
+              help='Articles recomputed per transaction.')
+def rebuild_stats_command(batch_size):
+    """Rebuild the feedback_stats rollup from the feedback table."""
+    from app.feedback_stats import rebuild_stats
+
+    total = 0
+    for processed in rebuild_stats(batch_size):
+        total += processed
+        click.echo(f'Rebuilt feedback stats for {total} articles')
+    click.echo(f'✅ Done: {total} articles')
+
+
+@articles_cli.command('import')
+@click.argument('source', type=click.File('rb'))
+@click.option('--chunk-size', default=500, show_default=True,
+              help='Rows inserted per transaction.')
+def import_command(source, chunk_size):
+    """Import articles from an NDJSON file (use - for stdin)."""
+    from app.bulk import import_articles
+
+    summary = import_articles(source, chunk_size)
+    for error in summary['errors']:
+        click.echo(f"line {error['line']}: {error['error']}", err=True)
+    click.echo(f"✅ Imported {summary['imported']} articles, {summary['failed']} failed")
+
+
+@articles_cli.command('export')
+@click.argument('target', type=click.File('w'), default='-')
+def export_command(target):
+    """Export all articles as NDJSON to a file (default stdout)."""
+    from app.bulk import export_articles
+    from app.streaming import buffered, ndjson_parts
+
+    for chunk in buffered(ndjson_parts(export_articles())):
+        target.write(chunk)
+
+
+@perf_cli.command('explain')
+@click.option('--verbose', is_flag=True, help='Print every plan, not just failures.')
+def explain_command(verbose):
+    """EXPLAIN every query issued by the read routes; fail on full table scans.
+
+    Runs against the configured database, which should contain at least one
+    row per table. PostgreSQL may legitimately prefer sequential scans on
+    very small tables, so run this on realistically sized data there.
+    """
+    from app.plans import EXPLAIN_ROUTES, explain_routes, route_values
+
+    values = route_values()
+    if values is None:
+        raise click.ClickException('Seed some articles and tags first')
+
+    failures = 0
+    for query in explain_routes(values):
+        if query.scans:
+            failures += 1
+            click.echo(f'❌ {query.url}: full scan of {", ".join(sorted(query.scans))}')
+        if query.scans or verbose:
+            click.echo('   ' + ' '.join(query.statement.split())[:200])
+            for line in query.plan:
+                click.echo(f'     {line}')
+
+    if failures:
+        raise click.ClickException(f'{failures} queries fall back to full table scans')
+    click.echo(f'✅ All queries for {len(EXPLAIN_ROUTES)} routes use indexes')
+
+
+@perf_cli.command('related')
+@click.option('--samples', default=200, show_default=True, help='Articles to rank.')
+@click.option('--limit', default=5, show_default=True, help='Related articles per lookup.')
+@click.option('--seed', default=0, show_default=True, help='Random seed for sampling.')
+def related_benchmark_command(samples, limit, seed):
+    """Time related-article ranking for random articles in the configured database."""
+    from app import db
+    from app.models import Article
+    from app.related import related_articles
+
+    max_id = db.session.query(db.func.max(Article.id)).scalar()
+    if max_id is None:
+        raise click.ClickException('Seed some articles first')
+    rng = random.Random(seed)
+
+    timings = []
+    while len(timings) < samples:
+        article_id = rng.randint(1, max_id)
+        started = time.perf_counter()
+        ranked = related_articles(article_id, limit)
+        elapsed = (time.perf_counter() - started) * 1000
+        if ranked is not None:
+            timings.append(elapsed)
+        db.session.rollback()  # release the read transaction between samples
+
+    timings.sort()
+    count = db.session.query(db.func.count(Article.id)).scalar()
+    click.echo(f'{samples} lookups over {count} articles (limit {limit}):')
+    for label, quantile in (('p50', 0.5), ('p95', 0.95), ('p99', 0.99)):
+        click.echo(f'  {label}: {timings[int(quantile * (len(timings) - 1))]:.2f} ms')
+    click.echo(f'  max: {timings[-1]:.2f} ms')
+
+
+@perf_cli.command('generate')
+@click.option('--articles', default=10000, show_default=True, help='Articles to have in total.')
+@click.option('--users', type=int, help='Users to have in total (default: scales with articles).')
+@click.option('--categories', type=int, help='Categories to have in total.')
+@click.option('--tags', type=int, help='Tags to have in total.')
+@click.option('--seed', default=0, show_default=True, help='Random seed.')
+@click.option('--batch-size', default=5000, show_default=True, help='Rows inserted per transaction.')
+@click.option('--reset', is_flag=True, help='Drop and recreate all tables first (destroys data).')
+def generate_command(articles, users, categories, tags, seed, batch_size, reset):
+    """Add synthetic users, articles, tags and feedback (see app/datagen.py)."""
+    from app import db
+    from app.datagen import generate_dataset
+
+    if reset:
+        click.confirm('Drop all tables and generate a fresh dataset?', abort=True)
+        db.drop_all()
+    db.create_all()
+
+    started = time.perf_counter()
+    added = generate_dataset(articles, users, categories, tags, seed, batch_size, progress=click.echo)
+    elapsed = time.perf_counter() - started
+    click.echo(f'✅ Added {sum(added.values())} rows in {elapsed:.1f}s: '
+               + ', '.join(f'{count} {table}' for table, count in added.items()))
+
+
+@perf_cli.command('bench')
+@click.option('--scale', 'scales', type=int, multiple=True,
+              help='Regenerate the database with this many articles and benchmark it; '
+                   'repeatable. Without it the current data is used.')
+@click.option('--per-page', 'per_page_values', type=int, multiple=True,
+              help='per_page for listing routes; repeatable.  [default: 10, 50]')
+@click.option('--requests', default=50, show_default=True, help='Measured requests per route.')
+@click.option('--warmup', default=5, show_default=True, help='Unmeasured requests per route.')
+@click.option('--route', 'routes', multiple=True, help='Only benchmark this route name; repeatable.')
+@click.option('--seed', default=0, show_default=True, help='Random seed for data and sampling.')
+@click.option('--output', type=click.File('w'), default='-', help='Where to write the JSON report.')
+@click.option('--baseline', type=click.File('r'), help='Earlier report to check for regressions.')
+@click.option('--tolerance', default=1.25, show_default=True,
+              help='Allowed p50 growth factor against the baseline.')
+@click.option('--yes', is_flag=True, help='Do not ask before dropping tables for --scale.')
+def bench_command(scales, per_page_values, requests, warmup, routes, seed, output, baseline, tolerance, yes):
+    """Benchmark every route; prints a JSON report, fails on regressions against --baseline.
+
+    With --scale the database is dropped and regenerated for each scale, so
+    point DATABASE_URL at a scratch database.
+    """
+    from app import db
+    from app.bench import DEFAULT_PER_PAGE, READ_ROUTES, WRITE_ROUTES, Benchmark, compare_results, run_metadata
+    from app.datagen import generate_dataset
+
+    known = {route.name for route in READ_ROUTES + WRITE_ROUTES}
+    unknown = set(routes) - known
+    if unknown:
+        raise click.BadParameter(f"unknown route(s) {', '.join(sorted(unknown))}", param_hint='--route')
+    if scales and not yes:
+        click.confirm(f'Drop all tables in {db.engine.url.render_as_string()} for each scale?', abort=True)
+
+    per_page_values = per_page_values or DEFAULT_PER_PAGE
+    results = []
+    for scale in scales or (None,):
+        if scale is not None:
+            click.echo(f'Generating {scale} articles...', err=True)
+            db.drop_all()
+            db.create_all()
+            generate_dataset(scale, seed=seed)
+            db.session.remove()
+        click.echo(f'Benchmarking{f" scale {scale}" if scale else ""}...', err=True)
+        benchmark = Benchmark(current_app._get_current_object(), requests, warmup, seed, routes)
+        for result in benchmark.run(per_page_values):
+            results.append({'scale': scale, **result})
+
+    report = {
+        'meta': run_metadata(current_app, requests=requests, warmup=warmup, seed=seed,
+                             per_page=list(per_page_values)),
+        'results': results,
+    }
+    json.dump(report, output, indent=2)
+    output.write('\n')
+
+    if baseline is not None:
+        regressions = compare_results(json.load(baseline)['results'], results, tolerance)
+        for regression in regressions:
+            click.echo(f"❌ {regression['route']} (scale {regression['scale']}, per_page "
+                       f"{regression['per_page']}): {regression['metric']} "
+                       f"{regression['baseline']} -> {regression['current']}", err=True)
+        if regressions:
+            raise click.ClickException(f'{len(regressions)} regressions against the baseline')
+        click.echo('✅ No regressions against the baseline', err=True)
+
+
+@click.command('create-db')
+def create_db_command():
+    """Create any missing tables, bypassing migrations (scratch databases only).
+
+    Deployed databases are managed with `flask db upgrade`; run `flask
+    stamp-existing` first on a database this command created.
+    """
+    from app import db
+
+    db.create_all()
+    click.echo('✅ Database tables created')
+
+
+def index_names(connection, table):
+    """Index names on `table`, including the expression indexes SQLite reflection skips."""
+    from sqlalchemy import inspect, text
+
+    if connection.dialect.name == 'sqlite':
+        return set(connection.execute(
+            text("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = :table"),
+            {'table': table}
+        ).scalars())
+    return {index['name'] for index in inspect(connection).get_indexes(table)}
+
+
+def create_all_revision(connection):
+    """The migration a schema built by db.create_all() matches, or None for an empty database.
+
+    Checks, newest first, for an object each migration added.
+    """
+    from sqlalchemy import inspect
+
+    inspector = inspect(connection)
+    tables = set(inspector.get_table_names())
+    if 'articles' not in tables:
+        return None
+    if 'ix_users_firebase_uid' in index_names(connection, 'users'):
+        return 'f2b7c9d4a6e1'
+    if 'ix_tags_name_lower' in index_names(connection, 'tags'):
+        return 'e4a8b2c6d1f0'
+    if 'ix_articles_created_at_id' in index_names(connection, 'articles'):
+        return 'c7f3a9d1e5b8'
+    if 'feedback_stats' in tables:
+        return '8c41d2e6f9b3'
+    columns = {column['name'] for column in inspector.get_columns('articles')}
+    if 'articles_fts' in tables or 'search_vector' in columns:
+        return '3b9e1f0c7a2d'
+    if 'feedback' in tables:
+        return 'daefc04a582a'
+    return '5de85841a97b'
+
+
+@click.command('stamp-existing')
+def stamp_existing_command():
+    """Put a database built by create-db under migrations, so `flask db upgrade` can manage it.
+
+    Does nothing for empty databases and for databases that already have
+    a migration history.
+    """
+    from flask_migrate import stamp
+    from sqlalchemy import inspect
+
+    from app import db
+
+    with db.engine.connect() as connection:
+        if inspect(connection).has_table('alembic_version'):
+            click.echo('Database already has a migration history')
+            return
+        revision = create_all_revision(connection)
+    if revision is None:
+        click.echo('Database is empty; `flask db upgrade` will create the schema')
+        return
+    stamp(revision=revision)
+    click.echo(f'✅ Stamped existing schema as revision {revision}')
+
+
+@click.command('seed')
+@click.option('--reset', is_flag=True, help='Drop all tables first (destroys data).')
+def seed_command(reset):
+    """Load the sample data (skipped when the database already has users)."""
+    from sqlalchemy import inspect
+
+    from app import db
+    from app.models import User
+    from seed import seed_database
+
+    if reset:
+        click.confirm('Drop all tables and reseed?', abort=True)
+    elif inspect(db.engine).has_table(User.__tablename__) and User.query.first() is not None:
+        click.echo('Database already contains data; use --reset to start over')
+        return
+    seed_database(reset=reset)
+
+
+def register_commands(app):
+    app.cli.add_command(create_db_command)
+    app.cli.add_command(stamp_existing_command)
+    app.cli.add_command(seed_command)
+    app.cli.add_command(feedback_cli)
+    app.cli.add_command(articles_cli)
+    app.cli.add_command(perf_cli)
@@ -0,0 +1,58 @@
+# app/conditional.py
+# Conditional GET (ETag / Last-Modified) for views with cheap validators.
+#
+# A validator computes (etag, last_modified) from metadata only, e.g.
+# Article.updated_at, without loading article bodies. When the client's
+# If-None-Match / If-Modified-Since still matches, a 304 is returned before
+# the view runs, so nothing is queried or serialized beyond the validator.
+#
+# Validators are only as good as the timestamps behind them: every write
+# that changes what a response shows, including the author data embedded
+# in article payloads, must move articles.updated_at (see update_user).
+from functools import wraps
+
+from flask import current_app, jsonify, request
+
+
+def not_modified(etag, last_modified):
+    """True when the request's validators match the current state."""
+    if request.if_none_match:
+        # Weak comparison is the correct one for GET (RFC 9110 13.1.2)
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since and last_modified:
+        # HTTP dates have one-second precision
+        return last_modified.replace(microsecond=0) <= request.if_modified_since.replace(tzinfo=None)
+    return False
+
+
+def conditional(validator):
+    """Answer GET requests with 304 when `validator` says nothing changed.
+
+    `validator` receives the view arguments and returns (etag, last_modified),
+    or None when the resource does not exist (the view then runs as usual).
+    ETags are weak because they are derived from timestamps, not response bytes.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            try:
+                validators = validator(**kwargs)
+            except Exception as e:
+                return jsonify({'error': str(e)}), 500
+            if validators is None:
+                return view(*args, **kwargs)
+
+            etag, last_modified = validators
+            if not_modified(etag, last_modified):
+                response = current_app.response_class(status=304)
+            else:
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag, weak=True)
+            if last_modified:
+                response.last_modified = last_modified
+            return response
+        return wrapper
+    return decorator
@@ -1,8 +1,20 @@
 # app/config.py
+# The one place settings come from. create_app() picks a profile:
+#
+#   development - (default) local SQLite in instance/, debug on
+#   testing     - in-memory SQLite, response cache off
+#   production  - what Render runs (FLASK_ENV=production)
+#
+# The profile is chosen by the create_app(profile) argument, else APP_ENV,
+# else FLASK_ENV. Every setting can be overridden through the environment;
+# a .env file is read when the config is built, not at import. Building a
+# config touches neither the filesystem nor the database.
 import os
+from datetime import timedelta
 from dotenv import load_dotenv
 
-load_dotenv()
+from app.db_pool import InstrumentedQueuePool
+from app.passwords import DEFAULT_LOCK_DIR
 
 # app directory (this file lives in app/)
 BASE_DIR = os.path.abspath(os.path.dirname(__file__))
@@ -10,29 +22,137 @@ BASE_DIR = os.path.abspath(os.path.dirname(__file__))
 # project root (one level up from app/)
 PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, os.pardir))
 
-# ensure the instance folder exists at project root/instance
+# instance folder at project root; created by create_app when SQLite needs it
 INSTANCE_DIR = os.path.join(PROJECT_ROOT, "instance")
-os.makedirs(INSTANCE_DIR, exist_ok=True)
-
-# default absolute sqlite path (guaranteed)
-default_sqlite_path = os.path.join(INSTANCE_DIR, "knowledge.db")
-default_sqlite_url = f"sqlite:///{default_sqlite_path}"
-
-# read DATABASE_URL from env if provided; otherwise use absolute default
-DATABASE_URL = os.environ.get("DATABASE_URL", default_sqlite_url)
-
-# If DATABASE_URL is a relative sqlite URL like "sqlite:///instance/knowledge.db",
-# convert it to an absolute path to avoid nested-instance problems.
-if DATABASE_URL.startswith("sqlite:///"):
-    # path part after scheme
-    path_part = DATABASE_URL[len("sqlite:///"):]
-    # If path_part is not absolute, make it absolute relative to project root
-    if not os.path.isabs(path_part):
-        abs_path = os.path.abspath(os.path.join(PROJECT_ROOT, path_part))
-        # Normalize to forward slashes for SQLAlchemy URL
-        DATABASE_URL = "sqlite:///" + abs_path.replace("\\", "/")
+
+DEFAULT_SQLITE_URL = "sqlite:///" + os.path.join(INSTANCE_DIR, "knowledge_base.db").replace("\\", "/")
+
+def env_int(name, default):
+    return int(os.environ.get(name, default))
+
+def env_flag(name, default):
+    return os.environ.get(name, '1' if default else '0').lower() in ('1', 'true', 'yes')
+
+def normalize_database_url(url):
+    """Fix Heroku/Render style postgres:// URLs and make SQLite paths absolute.
+
+    A relative SQLite URL like "sqlite:///instance/knowledge.db" is taken
+    relative to the project root, avoiding nested-instance problems.
+    """
+    url = url.replace('postgres://', 'postgresql://', 1) if url.startswith('postgres://') else url
+    if url.startswith("sqlite:///"):
+        path_part = url[len("sqlite:///"):]
+        if path_part and path_part != ':memory:' and not os.path.isabs(path_part):
+            abs_path = os.path.abspath(os.path.join(PROJECT_ROOT, path_part))
+            # Normalize to forward slashes for SQLAlchemy URL
+            url = "sqlite:///" + abs_path.replace("\\", "/")
+    return url
+
+def engine_options(database_url):
+    """SQLALCHEMY_ENGINE_OPTIONS for `database_url`, tunable through DB_* env vars.
+
+    SQLite keeps SQLAlchemy's default pool (connections are in-process and
+    cheap); its pragmas come from SQLITE_* settings, see app/db_pool.py.
+    """
+    if database_url.startswith('sqlite'):
+        return {}
+
+    options = {
+        'poolclass': InstrumentedQueuePool,
+        'pool_size': env_int('DB_POOL_SIZE', 5),
+        'max_overflow': env_int('DB_MAX_OVERFLOW', 10),
+        # Seconds a request waits for a free connection before failing
+        'pool_timeout': env_int('DB_POOL_TIMEOUT', 30),
+        # Replace connections before the server or a proxy drops idle ones
+        'pool_recycle': env_int('DB_POOL_RECYCLE', 1800),
+        # Test each connection on checkout; stale ones are replaced transparently
+        'pool_pre_ping': env_flag('DB_POOL_PRE_PING', True),
+    }
+    statement_timeout = env_int('DB_STATEMENT_TIMEOUT_MS', 0)
+    if statement_timeout and database_url.startswith('postgresql'):
+        options['connect_args'] = {'options': f'-c statement_timeout={statement_timeout}'}
+    return options
 
 class Config:
-    SQLALCHEMY_DATABASE_URI = DATABASE_URL
-    SQLALCHEMY_TRACK_MODIFICATIONS = False
-    SECRET_KEY = os.environ.get("SECRET_KEY", "dev_secret")
+    """Settings shared by all profiles, read from the environment when instantiated."""
+    DEBUG = False
+    TESTING = False
+    DEFAULT_DATABASE_URL = DEFAULT_SQLITE_URL
+    DEFAULT_CACHE_ENABLED = True
+    DEFAULT_SUGGEST_BACKGROUND_BUILD = True
+    # Refuse to fall back to the well-known development secret
+    REQUIRE_SECRET_KEY = False
+
+    def __init__(self):
+        database_url = normalize_database_url(os.environ.get("DATABASE_URL", self.DEFAULT_DATABASE_URL))
+
+        secret_key = os.environ.get("SECRET_KEY")
+        if not secret_key and self.REQUIRE_SECRET_KEY:
+            raise ValueError(f"SECRET_KEY must be set for the {self.__class__.__name__} profile")
+        self.SECRET_KEY = secret_key or "dev_secret"
+        self.SQLALCHEMY_DATABASE_URI = database_url
+        self.SQLALCHEMY_TRACK_MODIFICATIONS = False
+        # Pool sizing, recycling, pre-ping and timeouts
+        self.SQLALCHEMY_ENGINE_OPTIONS = engine_options(database_url)
+        self.SQLITE_BUSY_TIMEOUT_MS = env_int('SQLITE_BUSY_TIMEOUT_MS', 5000)
+        self.SQLITE_WAL = env_flag('SQLITE_WAL', True)
+
+        # Response cache: in-process by default, CACHE_BACKEND=redis to share across workers
+        self.CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'memory')
+        self.CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL', 'redis://localhost:6379/0')
+        self.CACHE_DEFAULT_TTL = env_int('CACHE_DEFAULT_TTL', 60)
+        self.CACHE_MAX_ENTRIES = env_int('CACHE_MAX_ENTRIES', 1024)
+        self.CACHE_ENABLED = env_flag('CACHE_ENABLED', self.DEFAULT_CACHE_ENABLED)
+
+        # Typeahead: per-worker memory index by default, SUGGEST_BACKEND=database for strict consistency
+        self.SUGGEST_BACKEND = os.environ.get('SUGGEST_BACKEND', 'memory')
+        self.SUGGEST_REFRESH_SECONDS = env_int('SUGGEST_REFRESH_SECONDS', 300)
+        self.SUGGEST_BACKGROUND_BUILD = env_flag('SUGGEST_BACKGROUND_BUILD', self.DEFAULT_SUGGEST_BACKGROUND_BUILD)
+
+        # Password hashing: werkzeug method string and limits on concurrent hashing (see app/passwords.py)
+        self.PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+        self.PASSWORD_HASH_CONCURRENCY = env_int('PASSWORD_HASH_CONCURRENCY', 2)
+        self.PASSWORD_HASH_QUEUE_DEPTH = env_int('PASSWORD_HASH_QUEUE_DEPTH', 2)
+        self.PASSWORD_HASH_WAIT_SECONDS = float(os.environ.get('PASSWORD_HASH_WAIT_SECONDS', 1.0))
+        # Slot lock files; workers sharing this directory share the limits
+        self.PASSWORD_HASH_LOCK_DIR = os.environ.get('PASSWORD_HASH_LOCK_DIR', DEFAULT_LOCK_DIR)
+
+        # Request instrumentation: /metrics, Server-Timing headers, slow-query log (0 = off)
+        self.METRICS_ENABLED = env_flag('METRICS_ENABLED', True)
+        self.SERVER_TIMING = env_flag('SERVER_TIMING', True)
+        self.SLOW_QUERY_MS = env_int('SLOW_QUERY_MS', 0)
+
+        # JWT access tokens carry username and role claims (see app/auth.py);
+        # signed with SECRET_KEY unless JWT_SECRET_KEY is set
+        self.JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY', self.SECRET_KEY)
+        self.JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=env_int('JWT_ACCESS_TOKEN_HOURS', 24))
+        # Per-worker profile cache for authenticated routes (0 = off)
+        self.PRINCIPAL_CACHE_TTL = env_int('PRINCIPAL_CACHE_TTL', 60)
+        self.PRINCIPAL_CACHE_MAX_ENTRIES = env_int('PRINCIPAL_CACHE_MAX_ENTRIES', 10000)
+
+class DevelopmentConfig(Config):
+    DEBUG = True
+
+class TestingConfig(Config):
+    TESTING = True
+    DEFAULT_DATABASE_URL = "sqlite:///:memory:"
+    DEFAULT_CACHE_ENABLED = False
+    # Each thread gets its own empty in-memory database, so build in the request
+    DEFAULT_SUGGEST_BACKGROUND_BUILD = False
+
+class ProductionConfig(Config):
+    REQUIRE_SECRET_KEY = True
+
+PROFILES = {
+    'development': DevelopmentConfig,
+    'testing': TestingConfig,
+    'production': ProductionConfig,
+}
+
+def load_config(profile=None):
+    """Config object for `profile`, chosen as described at the top of this file."""
+    load_dotenv()
+    profile = profile or os.environ.get('APP_ENV') or os.environ.get('FLASK_ENV') or 'development'
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown config profile '{profile}', expected one of {', '.join(PROFILES)}")
+    return PROFILES[profile]()
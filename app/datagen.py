@@ -0,0 +1,218 @@
+# app/datagen.py
+# Reproducible synthetic data for benchmarks and query-plan checks.
+#
+# generate_dataset() tops the database up to the requested number of users,
+# categories, tags and articles, then adds tags (popularity follows a
+# power law, like real tag clouds) and feedback rows for the new articles.
+# Everything is written with executemany INSERTs in chunks, one transaction
+# per chunk, and the feedback_stats rollup is rebuilt at the end.
+#
+# The same arguments and seed always produce the same rows. Article bodies
+# are slices of one pre-generated corpus with log-normally distributed
+# lengths (median around 300 words), so generating them costs no more than
+# inserting them. Generated users all have the password "password".
+import math
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+from werkzeug.security import generate_password_hash
+
+from app import db
+from app.bulk import chunked
+from app.feedback_stats import rebuild_stats
+from app.models import Article, ArticleTag, Category, Feedback, Tag, User
+
+DEFAULT_BATCH_SIZE = 5000
+PASSWORD = 'password'
+
+# Timestamps are spread over the two years before this date, not before now,
+# so reruns produce identical rows
+EPOCH = datetime(2025, 1, 1)
+SPAN_SECONDS = 2 * 365 * 24 * 3600
+
+WORDS = (
+    'api cache query index database server client request response latency '
+    'throughput python flask session token user article category tag feedback '
+    'search deploy release build pipeline test review merge branch commit '
+    'schema migration table column row join filter sort page cursor limit '
+    'offset stream buffer queue worker thread process pool connection timeout '
+    'retry error log metric trace alert dashboard config secret key value '
+    'json http route endpoint handler model view template form field '
+    'guide tutorial reference overview howto troubleshooting faq policy '
+    'onboarding security access role permission audit backup restore '
+    'performance scaling memory cpu disk network storage replica shard '
+    'the a of to and in for with on is that this by from as be are'
+).split()
+
+CONTENT_MEDIAN_CHARS = 1800
+CONTENT_SIGMA = 0.8
+CONTENT_MIN_CHARS = 200
+CONTENT_MAX_CHARS = 20000
+CORPUS_WORDS = 60000
+
+MAX_TAGS_PER_ARTICLE = 5
+MAX_FEEDBACK_PER_ARTICLE = 6
+ANONYMOUS_FEEDBACK_SHARE = 0.3
+COMMENT_SHARE = 0.4
+
+
+def dataset_spec(articles):
+    """Row counts for a dataset of `articles` articles, in realistic proportions."""
+    return {
+        'users': max(10, articles // 20),
+        'categories': min(50, max(5, articles // 1000)),
+        'tags': min(2000, max(20, articles // 50)),
+        'articles': articles,
+    }
+
+
+def random_timestamp(rng):
+    return EPOCH - timedelta(seconds=rng.randrange(SPAN_SECONDS))
+
+
+class TextSource:
+    """Titles and bodies cut from a seeded corpus."""
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.corpus = ' '.join(rng.choice(WORDS) for _ in range(CORPUS_WORDS))
+
+    def title(self):
+        words = self.rng.choices(WORDS, k=self.rng.randint(3, 7))
+        return ' '.join(words).capitalize()
+
+    def text(self, median_chars, sigma, min_chars, max_chars):
+        length = int(self.rng.lognormvariate(math.log(median_chars), sigma))
+        length = min(max(length, min_chars), max_chars)
+        start = self.rng.randrange(len(self.corpus) - length)
+        return self.corpus[start:start + length].strip()
+
+    def content(self):
+        return self.text(CONTENT_MEDIAN_CHARS, CONTENT_SIGMA, CONTENT_MIN_CHARS, CONTENT_MAX_CHARS)
+
+    def comment(self):
+        return self.text(80, 0.5, 20, 400)
+
+
+def insert_rows(model, rows, batch_size):
+    """Insert `rows` (an iterable of dicts) in chunks; returns the number inserted.
+
+    Goes through the Core table without RETURNING, so each chunk is one
+    executemany; the ORM bulk path and ordered RETURNING both fall back to
+    much smaller batches on SQLite.
+    """
+    statement = insert(model.__table__)
+    inserted = 0
+    for chunk in chunked(rows, batch_size):
+        db.session.execute(statement, chunk)
+        db.session.commit()
+        inserted += len(chunk)
+    return inserted
+
+
+def count(model):
+    return db.session.execute(db.select(db.func.count()).select_from(model)).scalar()
+
+
+def top_up(model, target, make_row, batch_size):
+    """Add rows until `model` has `target` rows; returns the ids of the new rows.
+
+    Assumes nothing else writes to the table meanwhile.
+    """
+    existing = count(model)
+    last_id = db.session.execute(db.select(db.func.max(model.id))).scalar() or 0
+    insert_rows(model, (make_row(existing + n) for n in range(target - existing)), batch_size)
+    return db.session.execute(
+        db.select(model.id).where(model.id > last_id).order_by(model.id)
+    ).scalars().all()
+
+
+def generate_dataset(articles, users=None, categories=None, tags=None,
+                     seed=0, batch_size=DEFAULT_BATCH_SIZE, progress=None):
+    """Top the database up to the given row counts; returns the rows added per table.
+
+    Counts not given follow dataset_spec(articles). Tags and feedback are
+    only generated for the articles added by this call. `progress`, if
+    given, is called with a message after each stage.
+    """
+    spec = dataset_spec(articles)
+    targets = {
+        'users': users if users is not None else spec['users'],
+        'categories': categories if categories is not None else spec['categories'],
+        'tags': tags if tags is not None else spec['tags'],
+    }
+    report = progress or (lambda message: None)
+    rng = random.Random(seed)
+    text = TextSource(rng)
+    password_hash = generate_password_hash(PASSWORD)
+    added = {}
+
+    added['users'] = len(top_up(User, targets['users'], lambda n: {
+        'username': f'user{n:07d}',
+        'email': f'user{n:07d}@example.com',
+        'password_hash': password_hash,
+        'role': 'employee',
+        'created_at': random_timestamp(rng),
+    }, batch_size))
+    added['categories'] = len(top_up(Category, targets['categories'], lambda n: {
+        'name': f'Category {n}',
+        'description': text.comment(),
+    }, batch_size))
+    added['tags'] = len(top_up(Tag, targets['tags'], lambda n: {
+        'name': f'tag-{n}',
+    }, batch_size))
+    user_ids = db.session.execute(db.select(User.id).order_by(User.id)).scalars().all()
+    category_ids = db.session.execute(db.select(Category.id).order_by(Category.id)).scalars().all()
+    tag_ids = db.session.execute(db.select(Tag.id).order_by(Tag.id)).scalars().all()
+    report(f'{len(user_ids)} users, {len(category_ids)} categories, {len(tag_ids)} tags')
+
+    def make_article(n):
+        created_at = random_timestamp(rng)
+        return {
+            'title': text.title(),
+            'content': text.content(),
+            'author_id': rng.choice(user_ids),
+            'category_id': rng.choice(category_ids),
+            'created_at': created_at,
+            'updated_at': created_at,
+        }
+
+    article_ids = top_up(Article, articles, make_article, batch_size)
+    added['articles'] = len(article_ids)
+    report(f'{len(article_ids)} articles')
+
+    def article_tags():
+        for article_id in article_ids:
+            # Pareto-distributed ranks: a few tags are on most articles
+            picked = {
+                tag_ids[min(int(rng.paretovariate(0.8)), len(tag_ids)) - 1]
+                for _ in range(rng.randint(0, MAX_TAGS_PER_ARTICLE))
+            }
+            for tag_id in picked:
+                yield {'article_id': article_id, 'tag_id': tag_id}
+
+    added['article_tags'] = insert_rows(ArticleTag, article_tags(), batch_size)
+    report(f"{added['article_tags']} article tags")
+
+    def feedback():
+        for article_id in article_ids:
+            entries = rng.randint(0, MAX_FEEDBACK_PER_ARTICLE)
+            # One entry per user and article, like the API enforces
+            voters = rng.sample(user_ids, min(entries, len(user_ids)))
+            for user_id in voters:
+                yield {
+                    'article_id': article_id,
+                    'user_id': None if rng.random() < ANONYMOUS_FEEDBACK_SHARE else user_id,
+                    'helpfulness_score': rng.choices((1, 2, 3, 4, 5), weights=(1, 1, 2, 4, 3))[0],
+                    'comment': text.comment() if rng.random() < COMMENT_SHARE else None,
+                    'created_at': random_timestamp(rng),
+                }
+
+    added['feedback'] = insert_rows(Feedback, feedback(), batch_size)
+    report(f"{added['feedback']} feedback entries")
+
+    for _ in rebuild_stats(batch_size):
+        pass
+    report('Feedback stats rebuilt')
+    return added
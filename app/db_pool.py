@@ -0,0 +1,120 @@
+# app/db_pool.py
+# Connection pool instrumentation and per-connection setup.
+#
+# Server databases use InstrumentedQueuePool, a QueuePool that also records
+# how long checkouts wait for a free connection and how many time out, so
+# pool exhaustion under bursts shows up in /internal/db-pool before it shows
+# up as errors. SQLite connections get WAL journaling (readers no longer
+# block the writer) and a busy timeout instead of failing immediately with
+# "database is locked".
+import threading
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool
+
+
+class WaitStats:
+    """Checkout wait counters, shared by a pool and the pools recreated from it."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, waited, timed_out):
+        with self.lock:
+            self.checkouts += 1
+            self.timeouts += timed_out
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                'checkouts': self.checkouts,
+                'timeouts': self.timeouts,
+                'total_wait_ms': round(self.total_wait * 1000, 2),
+                'avg_wait_ms': round(self.total_wait * 1000 / self.checkouts, 3) if self.checkouts else 0,
+                'max_wait_ms': round(self.max_wait * 1000, 2)
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool recording checkout wait time and timeouts."""
+
+    def __init__(self, *args, wait_stats=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_stats = wait_stats or WaitStats()
+
+    def recreate(self):
+        # dispose() and invalidation build a fresh pool; keep the counters
+        pool = super().recreate()
+        pool.wait_stats = self.wait_stats
+        return pool
+
+    def _do_get(self):
+        started = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            self.wait_stats.record(time.perf_counter() - started, timed_out)
+
+
+def configure_sqlite(engine, busy_timeout_ms, wal):
+    """Apply busy_timeout (and WAL for file databases) on every new connection."""
+    use_wal = wal and engine.url.database not in (None, '', ':memory:')
+
+    @event.listens_for(engine, 'connect')
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f'PRAGMA busy_timeout = {int(busy_timeout_ms)}')
+        if use_wal:
+            cursor.execute('PRAGMA journal_mode = WAL')
+            # Safe with WAL: a crash can lose the last commits, never corrupt
+            cursor.execute('PRAGMA synchronous = NORMAL')
+        cursor.close()
+
+
+def init_engine(app, engine):
+    """Per-connection setup for the app's engine, from app.config."""
+    if engine.dialect.name == 'sqlite':
+        configure_sqlite(
+            engine,
+            app.config.get('SQLITE_BUSY_TIMEOUT_MS', 5000),
+            app.config.get('SQLITE_WAL', True)
+        )
+
+
+def pool_stats(engine, max_overflow=None):
+    """Pool occupancy and checkout wait counters for this worker.
+
+    QueuePool has no public getter for its overflow limit, so the caller
+    passes the configured `max_overflow` (see SQLALCHEMY_ENGINE_OPTIONS);
+    it is left out when the pool runs on SQLAlchemy's default.
+    """
+    pool = engine.pool
+    stats = {
+        'dialect': engine.dialect.name,
+        'pool_class': type(pool).__name__,
+    }
+    if isinstance(pool, QueuePool):
+        stats.update({
+            'size': pool.size(),
+            'checked_in': pool.checkedin(),
+            'checked_out': pool.checkedout(),
+            # Negative while the pool has not yet opened `size` connections
+            'overflow': pool.overflow(),
+            'timeout_seconds': pool.timeout(),
+        })
+        if max_overflow is not None:
+            stats['max_overflow'] = max_overflow
+    if isinstance(pool, InstrumentedQueuePool):
+        stats['wait'] = pool.wait_stats.snapshot()
+    return stats
@@ -0,0 +1,16 @@
+# app/dialects.py
+# Per-dialect SQL constructs shared by modules that write with native upserts.
+#
+# SQLite and PostgreSQL both support INSERT ... ON CONFLICT; on any other
+# backend insert_for() returns None and callers fall back to portable SQL.
+from sqlalchemy.dialects import postgresql, sqlite
+
+UPSERT_DIALECTS = {
+    'sqlite': sqlite.insert,
+    'postgresql': postgresql.insert,
+}
+
+
+def insert_for(bind):
+    """The ON CONFLICT-capable insert() for `bind`'s dialect, or None."""
+    return UPSERT_DIALECTS.get(bind.dialect.name)
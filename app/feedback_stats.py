@@ -0,0 +1,158 @@
+# app/feedback_stats.py
+# Feedback statistics backed by the feedback_stats rollup table.
+#
+# Every feedback write adjusts the article's rollup row in the same
+# transaction, so reading a summary is a primary-key lookup. Total, average,
+# per-score histogram and positive share all follow from the per-score
+# counters. rebuild_stats() recomputes the rollup from the feedback table
+# when it needs repairing.
+from app import db
+from app.dialects import insert_for
+from app.models import Article, Feedback, FeedbackStats
+
+SCORES = range(1, 6)
+POSITIVE_MIN_SCORE = 4
+
+
+def summarize(score_counts):
+    """Build the statistics dict from a {score: count} mapping."""
+    breakdown = {score: score_counts.get(score, 0) for score in SCORES}
+    total = sum(breakdown.values())
+    positive = sum(count for score, count in breakdown.items() if score >= POSITIVE_MIN_SCORE)
+    score_sum = sum(score * count for score, count in breakdown.items())
+
+    return {
+        'total_feedback': total,
+        'average_score': round(score_sum / total, 2) if total else 0,
+        'score_breakdown': breakdown,
+        'positive_feedback': positive,
+        'positive_percentage': round(positive / total * 100, 2) if total else 0
+    }
+
+
+def rollup_counts(stats):
+    """Return {score: count} from a FeedbackStats row (or None)."""
+    if stats is None:
+        return {}
+    return {score: getattr(stats, f'score_{score}') for score in SCORES}
+
+
+def article_stats(article_id):
+    """Feedback statistics for one article."""
+    return summarize(rollup_counts(db.session.get(FeedbackStats, article_id)))
+
+
+def record_feedback(article_id, score, created_at):
+    """Add one feedback entry to the article's rollup row.
+
+    Runs inside the caller's transaction; the caller commits.
+    """
+    table = FeedbackStats.__table__
+    score_column = f'score_{score}'
+    increments = {
+        'feedback_count': table.c.feedback_count + 1,
+        'score_sum': table.c.score_sum + score,
+        score_column: table.c[score_column] + 1,
+        'last_feedback_at': created_at
+    }
+
+    insert = insert_for(db.session.get_bind())
+    if insert is not None:
+        row = {
+            'article_id': article_id,
+            'feedback_count': 1,
+            'score_sum': score,
+            'last_feedback_at': created_at,
+            **{f'score_{s}': int(s == score) for s in SCORES}
+        }
+        db.session.execute(
+            insert(table).values(**row).on_conflict_do_update(
+                index_elements=[table.c.article_id],
+                set_=increments
+            )
+        )
+        return
+
+    # No native upsert: update, then create the row if there was none
+    result = db.session.execute(
+        table.update().where(table.c.article_id == article_id).values(**increments)
+    )
+    if result.rowcount == 0:
+        db.session.add(FeedbackStats(
+            article_id=article_id,
+            feedback_count=1,
+            score_sum=score,
+            last_feedback_at=created_at,
+            **{f'score_{s}': int(s == score) for s in SCORES}
+        ))
+
+
+def retract_feedback(article_id, score, feedback_id):
+    """Remove feedback entry `feedback_id` from the article's rollup row.
+
+    last_feedback_at falls back to the newest remaining entry (NULL if none),
+    read in the same UPDATE so a concurrent write can't slip in between.
+    """
+    table = FeedbackStats.__table__
+    score_column = f'score_{score}'
+    newest_remaining = db.select(db.func.max(Feedback.created_at)).where(
+        Feedback.article_id == table.c.article_id,
+        Feedback.id != feedback_id
+    ).scalar_subquery()
+    db.session.execute(
+        table.update().where(table.c.article_id == article_id).values(
+            feedback_count=table.c.feedback_count - 1,
+            score_sum=table.c.score_sum - score,
+            last_feedback_at=newest_remaining,
+            **{score_column: table.c[score_column] - 1}
+        )
+    )
+
+
+def rollup_select():
+    """SELECT computing rollup rows from the feedback table, per article."""
+    return db.select(
+        Feedback.article_id,
+        db.func.count(),
+        db.func.sum(Feedback.helpfulness_score),
+        *[
+            db.func.sum(db.case((Feedback.helpfulness_score == score, 1), else_=0))
+            for score in SCORES
+        ],
+        db.func.max(Feedback.created_at)
+    ).group_by(Feedback.article_id)
+
+
+def rebuild_stats(batch_size=1000):
+    """Recompute the rollup from the feedback table, one batch of articles at a time.
+
+    Each batch is its own transaction. Yields the number of articles
+    processed per batch so callers can report progress.
+    """
+    table = FeedbackStats.__table__
+    columns = [
+        'article_id', 'feedback_count', 'score_sum',
+        *[f'score_{score}' for score in SCORES],
+        'last_feedback_at'
+    ]
+    last_id = 0
+    while True:
+        article_ids = db.session.execute(
+            db.select(Article.id).where(Article.id > last_id)
+                                 .order_by(Article.id)
+                                 .limit(batch_size)
+        ).scalars().all()
+        if not article_ids:
+            break
+
+        db.session.execute(table.delete().where(table.c.article_id.in_(article_ids)))
+        db.session.execute(
+            table.insert().from_select(
+                columns,
+                rollup_select().where(Feedback.article_id.in_(article_ids))
+            )
+        )
+        db.session.commit()
+
+        last_id = article_ids[-1]
+        yield len(article_ids)
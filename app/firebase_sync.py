@@ -0,0 +1,118 @@
+# app/firebase_sync.py
+# Find, link or create the local user for a Firebase sign-in.
+#
+# The common case (a returning user) is one indexed lookup on firebase_uid
+# OR email. New users get a username from a single prefix scan over the
+# usernames starting with the requested base, and are inserted with the
+# dialect's INSERT ... ON CONFLICT DO NOTHING, so a concurrent sync of the
+# same account, or a username taken in the meantime, shows up as "no row
+# inserted" instead of an error. The sync then starts over from the lookup,
+# at most SYNC_ATTEMPTS times.
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.auth import PRINCIPAL_COLUMNS, principals
+from app.dialects import insert_for
+from app.models import User
+
+SYNC_ATTEMPTS = 3
+FIREBASE_PASSWORD_HASH = 'firebase_auth'  # never matches a password
+DEFAULT_ROLE = 'employee'
+
+USERNAME_LENGTH = User.__table__.c.username.type.length
+# Leaves room for a numeric suffix within the column length
+MAX_BASE_LENGTH = USERNAME_LENGTH - 6
+
+
+class SyncConflict(Exception):
+    """Concurrent writes kept winning; the client should retry."""
+
+
+def username_prefix_filter(base):
+    """Index-friendly case-sensitive `username startswith base`."""
+    if db.session.get_bind().dialect.name == 'sqlite':
+        # SQLite's LIKE is case-insensitive and skips the index; a range does neither
+        return db.and_(User.username >= base, User.username < base + '\uffff')
+    escaped = base.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return User.username.like(escaped + '%', escape='\\')
+
+
+def allocate_username(base):
+    """`base`, or `base` plus the smallest free numeric suffix, in one query."""
+    taken = set(db.session.execute(
+        db.select(User.username).where(username_prefix_filter(base))
+    ).scalars())
+    if base not in taken:
+        return base
+    suffix = 1
+    while f'{base}{suffix}' in taken:
+        suffix += 1
+    return f'{base}{suffix}'
+
+
+def insert_user(row):
+    """Insert `row` unless it conflicts with an existing user; returns the new id or None."""
+    table = User.__table__
+    insert = insert_for(db.session.get_bind())
+    if insert is not None:
+        return db.session.execute(
+            insert(table).values(**row).on_conflict_do_nothing().returning(table.c.id)
+        ).scalar()
+
+    # No native upsert: let the unique constraints decide inside a savepoint
+    try:
+        with db.session.begin_nested():
+            return db.session.execute(db.insert(table).values(**row).returning(table.c.id)).scalar()
+    except IntegrityError:
+        return None
+
+
+def sync_user(firebase_uid, email, username=None):
+    """Return the principal dict (see app/auth.py) for a Firebase account.
+
+    A user already linked to `firebase_uid` is returned as is; a user with
+    the same email is linked to it; otherwise a user is created with
+    `username` (default: the email's local part) made unique.
+    """
+    base = (username or email.split('@')[0])[:MAX_BASE_LENGTH]
+
+    for _ in range(SYNC_ATTEMPTS):
+        rows = db.session.execute(
+            db.select(*PRINCIPAL_COLUMNS)
+            .where(db.or_(User.firebase_uid == firebase_uid, User.email == email))
+        ).mappings().all()
+
+        linked = next((row for row in rows if row['firebase_uid'] == firebase_uid), None)
+        if linked is not None:
+            return dict(linked)
+
+        if rows:
+            # Existing account with this email: link it
+            user = {**rows[0], 'firebase_uid': firebase_uid}
+            try:
+                db.session.execute(
+                    db.update(User).where(User.id == user['id']).values(firebase_uid=firebase_uid)
+                )
+                db.session.commit()
+            except IntegrityError:
+                # A concurrent sync linked this uid to another row first
+                db.session.rollback()
+                continue
+            principals().invalidate(user['id'])
+            return user
+
+        user = {
+            'username': allocate_username(base),
+            'email': email,
+            'role': DEFAULT_ROLE,
+            'firebase_uid': firebase_uid,
+        }
+        user_id = insert_user({**user, 'password_hash': FIREBASE_PASSWORD_HASH})
+        if user_id is None:
+            # Lost a race on firebase_uid, email or username; look again
+            db.session.rollback()
+            continue
+        db.session.commit()
+        return {'id': user_id, **user}
+
+    raise SyncConflict()
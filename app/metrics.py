@@ -0,0 +1,201 @@
+# app/metrics.py
+# Request instrumentation: latency, SQL statement count and time, JSON
+# encoding time and response size per request.
+#
+# Engine events time every statement and add it to the current request's
+# stats (kept on flask.g). Each response gets a Server-Timing header, and
+# the numbers feed per-blueprint histograms served in Prometheus text format
+# at /metrics. Streamed responses are recorded when their last chunk has
+# been sent, so their body size and encoding time are complete.
+#
+# Histograms live in process memory: each gunicorn worker exposes its own,
+# and Prometheus sums them across scrape targets.
+#
+# SLOW_QUERY_MS > 0 logs statements slower than that, with the route and
+# the number of bound parameters but never their values.
+import threading
+from time import perf_counter
+
+from flask import current_app, g, has_app_context, request
+from sqlalchemy import event
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+PROMETHEUS_MIMETYPE = 'text/plain; version=0.0.4'
+
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by a tuple of label values."""
+
+    def __init__(self, name, help_text, buckets, labels):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.labels = labels
+        self.series = {}  # label values -> [bucket counts..., count, sum]
+        self.lock = threading.Lock()
+
+    def observe(self, label_values, value):
+        with self.lock:
+            series = self.series.get(label_values)
+            if series is None:
+                series = self.series[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[index] += 1
+            series[-2] += 1
+            series[-1] += value
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        with self.lock:
+            snapshot = {key: list(series) for key, series in self.series.items()}
+        for label_values, series in sorted(snapshot.items()):
+            labels = ','.join(f'{name}="{value}"' for name, value in zip(self.labels, label_values))
+            for bound, count in zip(self.buckets, series):
+                lines.append(f'{self.name}_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'{self.name}_bucket{{{labels},le="+Inf"}} {series[-2]}')
+            lines.append(f'{self.name}_count{{{labels}}} {series[-2]}')
+            lines.append(f'{self.name}_sum{{{labels}}} {series[-1]}')
+        return lines
+
+
+class Counter:
+    def __init__(self, name, help_text, labels):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, label_values):
+        with self.lock:
+            self.values[label_values] = self.values.get(label_values, 0) + 1
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} counter']
+        with self.lock:
+            snapshot = dict(self.values)
+        for label_values, value in sorted(snapshot.items()):
+            labels = ','.join(f'{name}="{value}"' for name, value in zip(self.labels, label_values))
+            lines.append(f'{self.name}{{{labels}}} {value}')
+        return lines
+
+
+def add_time(kind, seconds):
+    """Add `seconds` to the current request's `kind` timer (no-op outside requests)."""
+    if has_app_context():
+        stats = g.get('request_stats')
+        if stats is not None:
+            stats[kind] += seconds
+
+
+class Metrics:
+    """Flask extension collecting per-request stats and exporting them."""
+
+    def __init__(self):
+        labels = ('blueprint', 'method')
+        self.latency = Histogram(
+            'kb_request_duration_seconds', 'Request wall time.', LATENCY_BUCKETS, labels)
+        self.db_time = Histogram(
+            'kb_request_db_seconds', 'Time spent executing SQL per request.', LATENCY_BUCKETS, labels)
+        self.queries = Histogram(
+            'kb_request_db_queries', 'SQL statements per request.', QUERY_COUNT_BUCKETS, labels)
+        self.serialize_time = Histogram(
+            'kb_request_serialize_seconds', 'JSON encoding time per request.', LATENCY_BUCKETS, labels)
+        self.response_bytes = Histogram(
+            'kb_response_bytes', 'Response body size.', SIZE_BUCKETS, labels)
+        self.requests = Counter(
+            'kb_requests_total', 'Requests by outcome.', ('blueprint', 'method', 'status'))
+        self.slow_query_seconds = 0
+        self.server_timing = True
+
+    def init_app(self, app, engine):
+        self.slow_query_seconds = app.config.get('SLOW_QUERY_MS', 0) / 1000
+        self.server_timing = app.config.get('SERVER_TIMING', True)
+
+        event.listen(engine, 'before_cursor_execute', self.before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', self.after_cursor_execute)
+        app.before_request(self.before_request)
+        app.after_request(self.after_request)
+        app.extensions['metrics'] = self
+
+    # --- SQL ---
+
+    def before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        context._metrics_started = perf_counter()
+
+    def after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed = perf_counter() - context._metrics_started
+        if not has_app_context():
+            return
+        stats = g.get('request_stats')
+        if stats is not None:
+            stats['queries'] += 1
+            stats['db'] += elapsed
+        if self.slow_query_seconds and elapsed >= self.slow_query_seconds:
+            self.log_slow_query(statement, parameters, executemany, elapsed)
+
+    def log_slow_query(self, statement, parameters, executemany, elapsed):
+        if executemany:
+            redacted = f'{len(parameters)} parameter sets redacted'
+        else:
+            redacted = f'{len(parameters or ())} parameters redacted'
+        route = request.path if g.get('request_stats') is not None else 'cli'
+        current_app.logger.warning(
+            'Slow query (%.1f ms) on %s: %s [%s]',
+            elapsed * 1000, route, ' '.join(statement.split()), redacted
+        )
+
+    # --- Requests ---
+
+    def before_request(self):
+        g.request_stats = {'started': perf_counter(), 'queries': 0, 'db': 0.0, 'serialize': 0.0}
+
+    def after_request(self, response):
+        stats = g.get('request_stats')
+        if stats is None:
+            return response
+
+        if self.server_timing:
+            elapsed = perf_counter() - stats['started']
+            response.headers['Server-Timing'] = ', '.join([
+                f'db;dur={stats["db"] * 1000:.2f};desc="{stats["queries"]} queries"',
+                f'serialize;dur={stats["serialize"] * 1000:.2f}',
+                f'total;dur={elapsed * 1000:.2f}',
+            ])
+
+        labels = (request.blueprint or 'none', request.method)
+        status = str(response.status_code)
+        if response.is_streamed:
+            # Body is produced after this hook; record once it is sent
+            response.response = self.count_streamed(response.response, stats, labels, status)
+        else:
+            self.record(stats, labels, status, response.calculate_content_length() or 0)
+        return response
+
+    def count_streamed(self, chunks, stats, labels, status):
+        size = 0
+        try:
+            for chunk in chunks:
+                size += len(chunk)
+                yield chunk
+        finally:
+            self.record(stats, labels, status, size)
+
+    def record(self, stats, labels, status, size):
+        self.latency.observe(labels, perf_counter() - stats['started'])
+        self.db_time.observe(labels, stats['db'])
+        self.queries.observe(labels, stats['queries'])
+        self.serialize_time.observe(labels, stats['serialize'])
+        self.response_bytes.observe(labels, size)
+        self.requests.inc(labels + (status,))
+
+    def render(self):
+        lines = []
+        for metric in (self.requests, self.latency, self.db_time, self.queries,
+                       self.serialize_time, self.response_bytes):
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
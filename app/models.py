@@ -7,7 +7,7 @@ class User(db.Model):
     username = db.Column(db.String(50), unique=True, nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False)
     password_hash = db.Column(db.String(255), nullable=False)
-    firebase_uid = db.Column(db.String(128), unique=True, nullable=True)  # NEW: Firebase UID
+    firebase_uid = db.Column(db.String(128), unique=True, index=True, nullable=True)  # NEW: Firebase UID
     role = db.Column(db.String(20), default="employee")  # Changed from "viewer"
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     articles = db.relationship(
@@ -17,6 +17,13 @@ class User(db.Model):
     )
     feedback_entries = db.relationship("Feedback", back_populates="user")
 
+    # Username prefix scans when allocating Firebase usernames; on SQLite the
+    # unique index already serves them as range scans
+    __table_args__ = (
+        db.Index('ix_users_username_pattern', 'username',
+                 postgresql_ops={'username': 'text_pattern_ops'}).ddl_if(dialect='postgresql'),
+    )
+
 class Category(db.Model):
     __tablename__ = "categories"
     id = db.Column(db.Integer, primary_key=True)
@@ -28,12 +35,24 @@ class Category(db.Model):
         cascade="all, delete-orphan"
     )
 
+    # Case-insensitive prefix lookups for /suggest (text_pattern_ops lets
+    # PostgreSQL serve LIKE 'prefix%' from the index)
+    __table_args__ = (
+        db.Index('ix_categories_name_lower', db.func.lower(name).label('name_lower'),
+                 postgresql_ops={'name_lower': 'text_pattern_ops'}),
+    )
+
 class Tag(db.Model):
     __tablename__ = "tags"
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(50), unique=True, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        db.Index('ix_tags_name_lower', db.func.lower(name).label('name_lower'),
+                 postgresql_ops={'name_lower': 'text_pattern_ops'}),
+    )
+
 class Article(db.Model):
     __tablename__ = "articles"
     id = db.Column(db.Integer, primary_key=True)
@@ -43,6 +62,8 @@ class Article(db.Model):
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     author_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
     category_id = db.Column(db.Integer, db.ForeignKey("categories.id"), nullable=False)
+    # Computed in SQL by listing queries (see app/queries.py); None otherwise
+    excerpt = db.query_expression()
 
     author = db.relationship("User", back_populates="articles")
     category = db.relationship("Category", back_populates="articles")
@@ -58,6 +79,22 @@ class Article(db.Model):
         back_populates="article",
         cascade="all, delete-orphan"
     )
+    feedback_stats = db.relationship(
+        "FeedbackStats",
+        uselist=False,
+        cascade="all, delete-orphan"
+    )
+
+    # Listings sort newest first, optionally filtered by category or author
+    __table_args__ = (
+        db.Index('ix_articles_created_at_id', created_at.desc(), id.desc()),
+        db.Index('ix_articles_category_created_at', category_id, created_at.desc()),
+        db.Index('ix_articles_author_created_at', author_id, created_at.desc()),
+        db.Index('ix_articles_updated_at', updated_at),
+        # Title prefix lookups for /suggest
+        db.Index('ix_articles_title_lower', db.func.lower(title).label('title_lower'),
+                 postgresql_ops={'title_lower': 'text_pattern_ops'}),
+    )
 
 class ArticleTag(db.Model):
     __tablename__ = "article_tags"
@@ -66,7 +103,11 @@ class ArticleTag(db.Model):
     tag_id = db.Column(db.Integer, db.ForeignKey("tags.id", ondelete="CASCADE"), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
-    __table_args__ = (db.UniqueConstraint('article_id', 'tag_id', name='unique_article_tag'),)
+    __table_args__ = (
+        db.UniqueConstraint('article_id', 'tag_id', name='unique_article_tag'),
+        # Tag -> articles direction (the unique constraint covers article -> tags)
+        db.Index('ix_article_tags_tag_article', 'tag_id', 'article_id'),
+    )
 
 class Feedback(db.Model):
     __tablename__ = "feedback"
@@ -80,6 +121,28 @@ class Feedback(db.Model):
     article = db.relationship("Article", back_populates="feedback_entries")
     user = db.relationship("User", back_populates="feedback_entries")
 
+    __table_args__ = (
+        # Per-article statistics and rollup rebuilds
+        db.Index('ix_feedback_article_score', 'article_id', 'helpfulness_score'),
+        # Per-article listing, newest first; also the duplicate-submission check
+        db.Index('ix_feedback_article_created_at', article_id, created_at.desc()),
+        # Per-user history, newest first
+        db.Index('ix_feedback_user_created_at', user_id, created_at.desc()),
+    )
+
+class FeedbackStats(db.Model):
+    # Per-article feedback rollup, maintained alongside every feedback write
+    __tablename__ = "feedback_stats"
+    article_id = db.Column(db.Integer, db.ForeignKey("articles.id", ondelete="CASCADE"), primary_key=True)
+    feedback_count = db.Column(db.Integer, nullable=False, default=0)
+    score_sum = db.Column(db.Integer, nullable=False, default=0)
+    score_1 = db.Column(db.Integer, nullable=False, default=0)
+    score_2 = db.Column(db.Integer, nullable=False, default=0)
+    score_3 = db.Column(db.Integer, nullable=False, default=0)
+    score_4 = db.Column(db.Integer, nullable=False, default=0)
+    score_5 = db.Column(db.Integer, nullable=False, default=0)
+    last_feedback_at = db.Column(db.DateTime)
+
 Tag.articles = db.relationship(
     "Article", 
     secondary="article_tags", 
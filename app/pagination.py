@@ -0,0 +1,95 @@
+# app/pagination.py
+# Keyset (cursor) pagination ordered by (created_at, id), newest first.
+#
+# Unlike .paginate(), no COUNT(*) over the filtered set is issued and deep
+# pages cost the same as the first one: each page seeks past the last row
+# of the previous page instead of skipping OFFSET rows.
+import base64
+import json
+from datetime import datetime
+
+from flask import request
+
+from app import db
+
+# Estimated totals stop counting here; beyond it the number is a lower bound
+ESTIMATE_CAP = 10000
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(created_at, row_id):
+    payload = json.dumps([created_at.isoformat(), row_id]).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError):
+        raise InvalidCursor('Invalid cursor')
+
+
+def page_size(per_page):
+    """`per_page` raised to at least one row, so every page can carry a cursor."""
+    return max(per_page, 1)
+
+
+def keyset_paginate(query, model, cursor, per_page):
+    """Return (items, next_cursor) for the page after `cursor`.
+
+    An empty cursor starts from the newest row. Any ordering already on
+    `query` is replaced, since the cursor only makes sense for
+    (created_at, id) order. next_cursor is None on the last page.
+    """
+    per_page = page_size(per_page)
+    query = query.order_by(None).order_by(model.created_at.desc(), model.id.desc())
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.filter(
+            db.tuple_(model.created_at, model.id) < db.tuple_(created_at, row_id)
+        )
+
+    # Fetch one extra row to know whether another page exists
+    items = query.limit(per_page + 1).all()
+    next_cursor = None
+    if len(items) > per_page:
+        items = items[:per_page]
+        last = items[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    return items, next_cursor
+
+
+def cursor_meta(query, next_cursor, per_page):
+    """Pagination block for cursor-mode responses.
+
+    Adds 'estimated_total' only when the client asks for it with ?estimate=1.
+    """
+    meta = {
+        'per_page': page_size(per_page),
+        'next_cursor': next_cursor
+    }
+    if request.args.get('estimate', type=int):
+        meta['estimated_total'] = estimate_total(query)
+    return meta
+
+
+def estimate_total(query):
+    """Cheap row-count estimate for a filtered query.
+
+    PostgreSQL answers from the planner's statistics without touching rows.
+    Elsewhere the count is capped at ESTIMATE_CAP so it stays bounded.
+    """
+    statement = query.order_by(None).statement
+    bind = db.session.get_bind()
+    if bind.dialect.name == 'postgresql':
+        compiled = statement.compile(bind, compile_kwargs={'literal_binds': True})
+        plan = db.session.execute(db.text(f'EXPLAIN (FORMAT JSON) {compiled}')).scalar()
+        return int(plan[0]['Plan']['Plan Rows'])
+
+    capped = statement.limit(ESTIMATE_CAP).subquery()
+    return db.session.execute(db.select(db.func.count()).select_from(capped)).scalar()
@@ -0,0 +1,173 @@
+# app/passwords.py
+# Password hashing with a cap on concurrent work, so a burst of logins or
+# registrations cannot occupy every worker and CPU and stall read endpoints.
+#
+# Each hash needs a slot. At most PASSWORD_HASH_CONCURRENCY hashes run at
+# once; up to PASSWORD_HASH_QUEUE_DEPTH more requests may wait (at most
+# PASSWORD_HASH_WAIT_SECONDS) for a slot. Anything beyond that is rejected
+# immediately with HashingBusy, which routes turn into 429 + Retry-After.
+#
+# Slots are lock files in PASSWORD_HASH_LOCK_DIR held with flock(), so the
+# limits apply to every worker process on the host, with or without
+# `gunicorn --preload`. The kernel drops a process's locks when it exits,
+# so a worker killed mid-hash cannot leak a slot. Where flock() is not
+# available the limits fall back to per-process semaphores. Hashing runs
+# in the request thread: hashlib's scrypt and pbkdf2 release the GIL, and
+# the concurrency cap is what keeps cores free for other requests.
+#
+# PASSWORD_HASH_METHOD takes any werkzeug method string, e.g.
+# "scrypt:32768:8:1" or "pbkdf2:sha256:600000". Hashes made with other
+# parameters keep working and are replaced on the user's next login.
+import os
+import tempfile
+import threading
+import time
+
+from flask import current_app, jsonify
+from werkzeug.security import check_password_hash, generate_password_hash
+
+try:
+    import fcntl
+except ImportError:  # not POSIX
+    fcntl = None
+
+DEFAULT_METHOD = 'scrypt:32768:8:1'
+DEFAULT_LOCK_DIR = os.path.join(tempfile.gettempdir(), 'knowledge-base-password-slots')
+RETRY_AFTER_SECONDS = 1
+POLL_SECONDS = 0.01
+
+
+class HashingBusy(Exception):
+    """Every hashing slot and queue place is taken; retry later."""
+
+
+def passwords():
+    """The current app's PasswordHasher extension."""
+    return current_app.extensions['passwords']
+
+
+def busy_response():
+    """429 for requests turned away by HashingBusy."""
+    return (
+        jsonify({'error': 'Too many sign-in requests in progress, please retry shortly'}),
+        429,
+        {'Retry-After': str(RETRY_AFTER_SECONDS)}
+    )
+
+
+def hash_method(password_hash):
+    """The method string a werkzeug hash was made with ("scrypt:32768:8:1")."""
+    return password_hash.split('$', 1)[0]
+
+
+class FileSlots:
+    """`count` slots shared by all processes using the same lock files.
+
+    Each acquire opens its own descriptor, so slots also exclude threads of
+    one process and descriptors inherited across fork are never shared.
+    """
+
+    def __init__(self, directory, name, count):
+        os.makedirs(directory, exist_ok=True)
+        self.paths = [os.path.join(directory, f'{name}-{index}.lock') for index in range(count)]
+
+    def try_acquire(self):
+        for path in self.paths:
+            fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return fd
+            except BlockingIOError:
+                os.close(fd)
+        return None
+
+    def acquire(self, timeout=0):
+        """Take a free slot, waiting up to `timeout` seconds; returns a token or None."""
+        deadline = time.monotonic() + timeout
+        while True:
+            fd = self.try_acquire()
+            if fd is not None or time.monotonic() >= deadline:
+                return fd
+            time.sleep(POLL_SECONDS)
+
+    def release(self, fd):
+        os.close(fd)  # drops the lock
+
+
+class ThreadSlots:
+    """FileSlots interface over a semaphore; limits apply per process."""
+
+    def __init__(self, count):
+        self.semaphore = threading.BoundedSemaphore(count)
+
+    def acquire(self, timeout=0):
+        return True if self.semaphore.acquire(timeout=timeout) else None
+
+    def release(self, token):
+        self.semaphore.release()
+
+
+def make_slots(directory, name, count):
+    if fcntl is None:
+        return ThreadSlots(count)
+    return FileSlots(directory, name, count)
+
+
+class PasswordHasher:
+    """Flask extension hashing and checking passwords within the configured limits."""
+
+    def __init__(self):
+        self.method = DEFAULT_METHOD
+        self.wait_seconds = 1.0
+        self.admitted = None  # running + queued slots
+        self.running = None
+
+    def init_app(self, app):
+        self.method = app.config.get('PASSWORD_HASH_METHOD', DEFAULT_METHOD)
+        self.wait_seconds = app.config.get('PASSWORD_HASH_WAIT_SECONDS', self.wait_seconds)
+        concurrency = app.config.get('PASSWORD_HASH_CONCURRENCY', 2)
+        queue_depth = app.config.get('PASSWORD_HASH_QUEUE_DEPTH', 2)
+        lock_dir = app.config.get('PASSWORD_HASH_LOCK_DIR', DEFAULT_LOCK_DIR)
+        self.admitted = make_slots(lock_dir, 'admitted', concurrency + queue_depth)
+        self.running = make_slots(lock_dir, 'running', concurrency)
+        app.extensions['passwords'] = self
+
+    def run(self, function, *args):
+        """Call `function(*args)` in a hashing slot; raises HashingBusy when saturated."""
+        admitted = self.admitted.acquire()
+        if admitted is None:
+            raise HashingBusy()
+        try:
+            running = self.running.acquire(self.wait_seconds)
+            if running is None:
+                raise HashingBusy()
+            try:
+                return function(*args)
+            finally:
+                self.running.release(running)
+        finally:
+            self.admitted.release(admitted)
+
+    def hash(self, password):
+        return self.run(generate_password_hash, password, self.method)
+
+    def verify(self, password_hash, password):
+        """Check `password`; returns (valid, new_hash).
+
+        new_hash is a replacement made with the configured method when the
+        password is valid but `password_hash` used other parameters, else None.
+        """
+        return self.run(self._verify, password_hash, password)
+
+    def _verify(self, password_hash, password):
+        if not check_password_hash(password_hash, password):
+            return False, None
+        if self.needs_rehash(password_hash):
+            return True, generate_password_hash(password, self.method)
+        return True, None
+
+    def needs_rehash(self, password_hash):
+        method = hash_method(password_hash)
+        # A bare "scrypt"/"pbkdf2:sha256" setting means werkzeug's defaults,
+        # which stored hashes spell out in full
+        return method != self.method and not method.startswith(self.method + ':')
@@ -0,0 +1,96 @@
+# app/plans.py
+# Query-plan checks: EXPLAIN every SELECT the read routes issue and flag
+# full scans of tables that grow with content.
+#
+# Used by `flask perf explain` and tests/test_query_plans.py. Routes are
+# driven through the test client with the response cache off, so every
+# request reaches the database.
+import re
+from collections import namedtuple
+
+from flask import current_app
+
+from app import cache, db
+from app.models import Article, Tag
+from app.queries import count_statements
+
+# One request per read route and filter combination the API supports
+EXPLAIN_ROUTES = [
+    '/articles',
+    '/articles?category_id={category_id}',
+    '/articles?author_id={author_id}',
+    '/articles?tag_id={tag_id}',
+    '/articles?search={search}',
+    '/articles?cursor=',
+    '/articles/{article_id}',
+    '/articles/tag/{tag_name}',
+    '/articles/{article_id}/related',
+    '/articles/{article_id}/feedback',
+    '/articles/{article_id}/feedback/summary',
+    '/feedback/summary?article_ids={article_id}',
+    '/users/{user_id}',
+    '/users/{user_id}/feedback',
+    '/categories',
+    '/tags',
+    '/users',
+]
+
+# Tables that grow with content; a full scan of these fails the check
+LARGE_TABLES = {'articles', 'article_tags', 'feedback', 'feedback_stats'}
+
+FULL_SCAN_PATTERNS = [
+    re.compile(r'^SCAN (\w+)$'),          # SQLite: scan without any index
+    re.compile(r'Seq Scan on (\w+)'),     # PostgreSQL
+]
+
+# One EXPLAINed statement; `scans` holds the large tables it scans in full
+QueryPlan = namedtuple('QueryPlan', 'url statement plan scans')
+
+
+def route_values():
+    """Values for the EXPLAIN_ROUTES placeholders, or None without articles and tags."""
+    article = Article.query.first()
+    tag = Tag.query.first()
+    if article is None or tag is None:
+        return None
+    return {
+        'article_id': article.id,
+        'author_id': article.author_id,
+        'category_id': article.category_id,
+        'user_id': article.author_id,
+        'tag_id': tag.id,
+        'tag_name': tag.name,
+        'search': article.title.split()[0],
+    }
+
+
+def full_scans(plan):
+    """Large tables that the plan lines scan without an index."""
+    return {
+        match.group(1)
+        for line in plan for pattern in FULL_SCAN_PATTERNS
+        for match in [pattern.search(line.strip())] if match
+    } & LARGE_TABLES
+
+
+def explain_routes(values, routes=EXPLAIN_ROUTES):
+    """Yield a QueryPlan for every SELECT issued by `routes`, filled in with `values`."""
+    engine = db.engine
+    explain_prefix = 'EXPLAIN QUERY PLAN ' if engine.dialect.name == 'sqlite' else 'EXPLAIN '
+    client = current_app.test_client()
+    cache_enabled, cache.enabled = cache.enabled, False
+    try:
+        for template in routes:
+            url = template.format(**values)
+            with count_statements() as statements:
+                client.get(url).get_data()
+
+            for statement, parameters in statements:
+                if not statement.lstrip().upper().startswith('SELECT'):
+                    continue
+                with engine.connect() as conn:
+                    rows = conn.exec_driver_sql(explain_prefix + statement, parameters).all()
+                plan = [str(row[-1]) for row in rows]
+                yield QueryPlan(url, statement, plan, full_scans(plan))
+    finally:
+        cache.enabled = cache_enabled
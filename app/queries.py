@@ -0,0 +1,106 @@
+# app/queries.py
+# Shared query builders with eager-loading options per endpoint shape.
+#
+# Relationships on the models are lazy by default, so serializing a page of
+# articles touches author/category/tags once per row (1 + 3N queries).
+# Each shape loads exactly what its serializer view (app/serializers.py)
+# reads: listed columns only, many-to-one via a JOIN, collections via one
+# extra SELECT ... IN per page. A sparse fieldset (?fields=) narrows both.
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from app import db
+from app.models import Article, ArticleTag, Category, Feedback, Tag, User
+from app.serializers import (
+    ARTICLE_DETAIL, ARTICLE_LIST, ARTICLE_SUMMARY,
+    FEEDBACK_BY_ARTICLE, FEEDBACK_BY_USER, USER_DETAIL
+)
+
+ARTICLE_VIEWS = {
+    'list': ARTICLE_LIST,       # GET /articles
+    'detail': ARTICLE_DETAIL,   # GET /articles/<id>
+    'by_tag': ARTICLE_SUMMARY,  # GET /articles/tag/<name>
+}
+
+FEEDBACK_VIEWS = {
+    'by_article': FEEDBACK_BY_ARTICLE,  # GET /articles/<id>/feedback
+    'by_user': FEEDBACK_BY_USER,        # GET /users/<id>/feedback
+}
+
+USER_VIEWS = {
+    'detail': USER_DETAIL,  # GET /users/<id>
+}
+
+
+def articles_query(shape, fields=None):
+    """Article query preloading what the `shape` endpoint serializes.
+
+    `fields` optionally limits loading to the requested fields.
+    """
+    return Article.query.options(*ARTICLE_VIEWS[shape].loader_options(fields))
+
+
+def feedback_query(shape):
+    """Feedback query preloading what the `shape` endpoint serializes."""
+    return Feedback.query.options(*FEEDBACK_VIEWS[shape].loader_options())
+
+
+def users_query(shape):
+    """User query preloading what the `shape` endpoint serializes."""
+    return User.query.options(*USER_VIEWS[shape].loader_options())
+
+
+def with_article_counts(model, owner_column):
+    """Select statement yielding (model, article_count) rows in id order.
+
+    Counts come from a grouped COUNT() over `owner_column` (a foreign key
+    column pointing at `model`), so no article rows are loaded.
+    """
+    counts = db.select(
+        owner_column.label('owner_id'),
+        db.func.count().label('article_count')
+    ).group_by(owner_column).subquery()
+
+    return db.select(
+        model,
+        db.func.coalesce(counts.c.article_count, 0)
+    ).outerjoin(counts, counts.c.owner_id == model.id).order_by(model.id)
+
+
+def categories_with_counts():
+    return with_article_counts(Category, Article.category_id)
+
+
+def tags_with_counts():
+    return with_article_counts(Tag, ArticleTag.tag_id)
+
+
+def users_with_counts():
+    return with_article_counts(User, Article.author_id)
+
+
+@contextmanager
+def count_statements():
+    """Count SQL statements issued inside the block.
+
+    Yields a list that collects a (statement, parameters) pair per
+    statement; use len() on it afterwards. Used for per-endpoint statement
+    budgets (tests/test_query_budgets.py), the benchmark and `flask perf
+    explain`:
+
+        with count_statements() as statements:
+            client.get('/articles?per_page=50')
+        assert len(statements) <= 3
+    """
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    engine = db.engine
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
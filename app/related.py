@@ -0,0 +1,144 @@
+# app/related.py
+# "Related articles" ranking computed with set-based SQL.
+#
+# Candidates are the articles sharing at least one tag with the source
+# article, read from the (tag_id, article_id) index on article_tags. Each
+# tag contributes at most CANDIDATES_PER_TAG of its newest articles, so the
+# cost of a lookup is bounded no matter how popular the tags are: niche tags
+# are covered completely, a tag on half the corpus only by its recent part.
+# Each candidate scores:
+#   - tag overlap: the sum of the shared tags' weights, where a tag's weight
+#     falls with the number of articles carrying it (a shared niche tag says
+#     more than a shared "python"); counts are capped at the same bound;
+#   - CATEGORY_BONUS when it is in the source's category;
+#   - FEEDBACK_WEIGHT times its average helpfulness from feedback_stats,
+#     centred on 3 and scaled to -1..1 (articles without feedback get 0).
+# An untagged source falls back to its category peers, ranked the same way.
+# Everything reads live tables, so the ranking never goes stale across
+# workers. Responses are cached under the 'articles' tag and the feedback tag
+# of every listed article, so feedback on a listed article re-ranks at once;
+# an unlisted candidate whose feedback would lift it into the list shows up
+# when the entry expires (CACHE_DEFAULT_TTL).
+from functools import lru_cache
+import math
+
+from app import db
+from app.models import Article, ArticleTag, FeedbackStats
+
+TAG_WEIGHT = 1.0
+CATEGORY_BONUS = 0.5
+FEEDBACK_WEIGHT = 0.25
+NEUTRAL_SCORE = 3
+
+CANDIDATES_PER_TAG = 200
+
+DEFAULT_LIMIT = 5
+MAX_LIMIT = 20
+
+# Statements are built once per tag count and reused: constructing and
+# cache-keying a fresh statement costs more than running it on SQLite.
+SOURCE_STATEMENT = db.select(Article.category_id, ArticleTag.tag_id)\
+                     .outerjoin(ArticleTag, ArticleTag.article_id == Article.id)\
+                     .where(Article.id == db.bindparam('article_id'))
+
+
+def tagged_with(tag_param):
+    """Newest CANDIDATES_PER_TAG article ids carrying a tag, as a subquery."""
+    return db.select(ArticleTag.article_id)\
+             .where(ArticleTag.tag_id == db.bindparam(tag_param))\
+             .order_by(ArticleTag.article_id.desc())\
+             .limit(CANDIDATES_PER_TAG)\
+             .subquery()
+
+
+def feedback_term():
+    average = FeedbackStats.score_sum * 1.0 / FeedbackStats.feedback_count
+    return db.case(
+        (FeedbackStats.feedback_count > 0,
+         FEEDBACK_WEIGHT * (average - NEUTRAL_SCORE) / (5 - NEUTRAL_SCORE)),
+        else_=0
+    )
+
+
+@lru_cache(maxsize=None)
+def frequency_statement(tag_count):
+    """Capped article counts for tags tag_0..tag_<n-1>, one index range each."""
+    return db.union_all(*[
+        db.select(db.bindparam(f'tag_{index}'), db.func.count())
+          .select_from(tagged_with(f'tag_{index}'))
+        for index in range(tag_count)
+    ])
+
+
+@lru_cache(maxsize=None)
+def ranking_statement(tag_count):
+    """Top related articles by weighted overlap on tags tag_0..tag_<n-1>."""
+    if not tag_count:
+        # Untagged source: its category's newest articles, ranked by feedback
+        pool = db.select(Article.id)\
+                 .where(Article.category_id == db.bindparam('category_id'),
+                        Article.id != db.bindparam('article_id'))\
+                 .order_by(Article.created_at.desc())\
+                 .limit(CANDIDATES_PER_TAG)\
+                 .subquery()
+        score = CATEGORY_BONUS + feedback_term()
+        query = db.select(Article.id, score.label('score'), db.literal(0))\
+                  .where(Article.id.in_(db.select(pool.c.id)))
+    else:
+        tags = [db.bindparam(f'tag_{index}') for index in range(tag_count)]
+        overlap = db.func.sum(db.case(
+            *[(ArticleTag.tag_id == tag, db.bindparam(f'weight_{index}'))
+              for index, tag in enumerate(tags)],
+            else_=0
+        ))
+        pool = db.union(*[
+            db.select(newest.c.article_id)
+            for newest in (tagged_with(f'tag_{index}') for index in range(tag_count))
+        ])
+        candidates = db.select(
+            ArticleTag.article_id.label('article_id'),
+            overlap.label('overlap'),
+            db.func.count().label('shared_tags')
+        ).where(
+            ArticleTag.article_id.in_(pool),
+            ArticleTag.article_id != db.bindparam('article_id'),
+            ArticleTag.tag_id.in_(tags)
+        ).group_by(ArticleTag.article_id).subquery()
+        category_term = db.case(
+            (Article.category_id == db.bindparam('category_id'), CATEGORY_BONUS), else_=0
+        )
+        score = TAG_WEIGHT * candidates.c.overlap + category_term + feedback_term()
+        query = db.select(candidates.c.article_id, score.label('score'), candidates.c.shared_tags)\
+                  .join(Article, Article.id == candidates.c.article_id)
+
+    return query.outerjoin(FeedbackStats, FeedbackStats.article_id == Article.id)\
+                .order_by(db.desc('score'), Article.id.desc())\
+                .limit(db.bindparam('limit'))
+
+
+def tag_weights(tag_ids):
+    """{tag_id: weight} for the given tags, rarer tags weighing more."""
+    if not tag_ids:
+        return {}
+    rows = db.session.execute(
+        frequency_statement(len(tag_ids)),
+        {f'tag_{index}': tag_id for index, tag_id in enumerate(tag_ids)}
+    ).all()
+    # Frequency includes the source itself, so it is at least 1
+    return {tag_id: 1 / math.log2(1 + frequency) for tag_id, frequency in rows}
+
+
+def related_articles(article_id, limit=DEFAULT_LIMIT):
+    """Ranked [(article_id, score, shared_tags)], or None if the article is missing."""
+    rows = db.session.execute(SOURCE_STATEMENT, {'article_id': article_id}).all()
+    if not rows:
+        return None
+    category_id = rows[0][0]
+    tag_ids = [tag_id for _, tag_id in rows if tag_id is not None]
+
+    params = {'article_id': article_id, 'category_id': category_id, 'limit': limit}
+    for index, (tag_id, weight) in enumerate(tag_weights(tag_ids).items()):
+        params[f'tag_{index}'] = tag_id
+        params[f'weight_{index}'] = weight
+    ranked = db.session.execute(ranking_statement(len(tag_ids)), params)
+    return [(row[0], round(row[1], 3), row[2]) for row in ranked]
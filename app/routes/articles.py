@@ -1,70 +1,143 @@
+from datetime import datetime
 from flask import Blueprint, jsonify, request
-from app.models import Article, Category, User, Tag
-from app import db
+from app.models import Article, ArticleTag, Category, User, Tag
+from app import db, cache
+from app.cache import cached, add_cache_tags
+from app.conditional import conditional
+from app.search import apply_search, highlight
+from app.queries import articles_query
+from app.serializers import (
+    ARTICLE_CREATED, ARTICLE_DETAIL, ARTICLE_LIST, ARTICLE_REF_DATED, ARTICLE_SUMMARY,
+    ARTICLE_UPDATED, TAG_REF
+)
+from app.related import related_articles, DEFAULT_LIMIT, MAX_LIMIT
+from app.pagination import InvalidCursor, keyset_paginate, cursor_meta
+from app.bulk import import_articles, export_articles, DEFAULT_CHUNK_SIZE
+from app.streaming import stream_ndjson
+from app.suggest import suggestions
 
 articles_bp = Blueprint('articles', __name__)
 
+def requested_fields():
+    """Sparse fieldset from ?fields=a,b,c (all list fields when absent); id is always kept."""
+    fields = request.args.get('fields')
+    if not fields:
+        return set(ARTICLE_LIST.fields)
+    return {'id'} | ({name.strip() for name in fields.split(',')} & set(ARTICLE_LIST.fields))
+
+def filter_articles(query):
+    """Apply the /articles filter parameters from the request to `query`."""
+    category_id = request.args.get('category_id', type=int)
+    tag_id = request.args.get('tag_id', type=int)
+    author_id = request.args.get('author_id', type=int)
+    search = request.args.get('search', type=str)
+    
+    if category_id:
+        query = query.filter(Article.category_id == category_id)
+    if author_id:
+        query = query.filter(Article.author_id == author_id)
+    if tag_id:
+        query = query.join(Article.tags).filter(Tag.id == tag_id)
+    if search:
+        # Ranked full-text match, newest first among equal ranks
+        query = apply_search(query, search)
+    return query
+
+def resolve_tags(tag_ids):
+    """Tags for `tag_ids` in request order with one IN query; unknown ids are skipped."""
+    tag_ids = list(dict.fromkeys(tag_ids))
+    if not tag_ids:
+        return []
+    found = {tag.id: tag for tag in Tag.query.filter(Tag.id.in_(tag_ids))}
+    return [found[tag_id] for tag_id in tag_ids if tag_id in found]
+
+def current_tag_ids(article_id):
+    return set(db.session.execute(
+        db.select(ArticleTag.tag_id).where(ArticleTag.article_id == article_id)
+    ).scalars())
+
+def write_article_tags(article_id, current_ids, tags):
+    """Insert and delete only the article_tags rows that change, in bulk.
+
+    Runs inside the caller's transaction; the caller commits.
+    """
+    wanted_ids = {tag.id for tag in tags}
+    removed = current_ids - wanted_ids
+    added = [tag.id for tag in tags if tag.id not in current_ids]
+    if removed:
+        db.session.execute(
+            db.delete(ArticleTag).where(
+                ArticleTag.article_id == article_id,
+                ArticleTag.tag_id.in_(removed)
+            )
+        )
+    if added:
+        db.session.execute(
+            db.insert(ArticleTag),
+            [{'article_id': article_id, 'tag_id': tag_id} for tag_id in added]
+        )
+
+def article_validators(article_id):
+    # Single-column lookup; content is never loaded. updated_at has
+    # microsecond precision and also moves when the author changes
+    updated_at = db.session.query(Article.updated_at).filter(Article.id == article_id).scalar()
+    if updated_at is None:
+        return None
+    return f'article-{article_id}-{updated_at.isoformat()}', updated_at
+
+def article_list_validators():
+    # Any create, update or delete moves either the count or max(updated_at)
+    count, last_modified = filter_articles(
+        db.session.query(db.func.count(Article.id), db.func.max(Article.updated_at))
+                  .select_from(Article)
+    ).order_by(None).one()
+    stamp = last_modified.isoformat() if last_modified else 'none'
+    return f'articles-{count}-{stamp}', last_modified
+
 # GET all articles with pagination and filtering
 @articles_bp.route('/articles', methods=['GET'])
+@conditional(article_list_validators)
+@cached('articles')
 def get_articles():
     try:
         # Pagination parameters
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 10, type=int)
-        
-        # Filtering parameters
-        category_id = request.args.get('category_id', type=int)
-        tag_id = request.args.get('tag_id', type=int)
-        author_id = request.args.get('author_id', type=int)
+        cursor = request.args.get('cursor')  # opt-in keyset mode
         search = request.args.get('search', type=str)
+        fields = requested_fields()
         
-        # Base query
-        query = Article.query
-        
-        # Apply filters
-        if category_id:
-            query = query.filter(Article.category_id == category_id)
-        if author_id:
-            query = query.filter(Article.author_id == author_id)
-        if tag_id:
-            query = query.join(Article.tags).filter(Tag.id == tag_id)
-        if search:
-            query = query.filter(
-                db.or_(
-                    Article.title.ilike(f'%{search}%'),
-                    Article.content.ilike(f'%{search}%')
-                )
-            )
+        # Base query with filters applied, loading only what `fields` needs
+        query = filter_articles(articles_query('list', fields))
         
         # Get paginated results
-        articles = query.order_by(Article.created_at.desc()).paginate(
-            page=page, per_page=per_page, error_out=False
-        )
+        if cursor is not None:
+            # Keyset mode orders by recency, even when searching
+            items, next_cursor = keyset_paginate(query, Article, cursor, per_page)
+        else:
+            articles = query.order_by(Article.created_at.desc()).paginate(
+                page=page, per_page=per_page, error_out=False
+            )
+            items = articles.items
+        
+        # Highlighted snippets for the current page only
+        snippets = highlight([article.id for article in items], search) if search else {}
         
         # Build response - UPDATED to match frontend expectations
+        dump = ARTICLE_LIST.dumper(fields)
         articles_data = []
-        for article in articles.items:
-            article_data = {
-                'id': article.id,
-                'title': article.title,
-                'excerpt': article.content[:150] + '...' if len(article.content) > 150 else article.content,
-                'content': article.content,  # Include full content for detail view
-                'author': {
-                    'id': article.author.id,
-                    'username': article.author.username,
-                    'email': article.author.email
-                },
-                'category': {
-                    'id': article.category.id,
-                    'name': article.category.name,
-                    'description': article.category.description
-                },
-                'tags': [{'id': tag.id, 'name': tag.name} for tag in article.tags],
-                'created_at': article.created_at.isoformat(),
-                'updated_at': article.updated_at.isoformat()
-            }
+        for article in items:
+            article_data = dump(article)
+            if article.id in snippets:
+                article_data['highlight'] = snippets[article.id]
             articles_data.append(article_data)
         
+        if cursor is not None:
+            return jsonify({
+                'articles': articles_data,
+                **cursor_meta(query, next_cursor, per_page)
+            }), 200
+        
         return jsonify({
             'articles': articles_data,
             'total': articles.total,
@@ -73,39 +146,60 @@ def get_articles():
             'pages': articles.pages
         }), 200
         
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 # GET single article by ID with full details
 @articles_bp.route('/articles/<int:article_id>', methods=['GET'])
+@conditional(article_validators)
+@cached('article:{article_id}')
 def get_article(article_id):
     try:
-        article = Article.query.get_or_404(article_id)
+        article = articles_query('detail').get_or_404(article_id)
+        add_cache_tags(f'user:{article.author_id}')
         
-        article_data = {
-            'id': article.id,
-            'title': article.title,
-            'content': article.content,
-            'author': {
-                'id': article.author.id,
-                'username': article.author.username,
-                'email': article.author.email  # Include email for detailed view
-            },
-            'category': {
-                'id': article.category.id,
-                'name': article.category.name,
-                'description': article.category.description
-            },
-            'tags': [{'id': tag.id, 'name': tag.name} for tag in article.tags],
-            'created_at': article.created_at.isoformat(),
-            'updated_at': article.updated_at.isoformat()
-        }
+        article_data = ARTICLE_DETAIL.dump(article)
         
         return jsonify(article_data), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+# GET articles related to one article by shared tags, category and feedback
+@articles_bp.route('/articles/<int:article_id>/related', methods=['GET'])
+@cached('articles', 'article:{article_id}')
+def get_related_articles(article_id):
+    try:
+        limit = min(max(request.args.get('limit', DEFAULT_LIMIT, type=int), 1), MAX_LIMIT)
+        
+        ranked = related_articles(article_id, limit)
+        if ranked is None:
+            return jsonify({'error': 'Article not found'}), 404
+        
+        # One query for the ranked rows, then restore ranking order
+        articles = Article.query.options(*ARTICLE_REF_DATED.loader_options())\
+                                .filter(Article.id.in_([related_id for related_id, _, _ in ranked]))\
+                                .all()
+        by_id = {article.id: article for article in articles}
+        # Feedback on a listed article moves its score; see app/related.py
+        add_cache_tags(*[f'feedback:{related_id}' for related_id in by_id])
+        
+        dump = ARTICLE_REF_DATED.dumper()
+        related_data = [
+            {**dump(by_id[related_id]), 'score': score, 'shared_tags': shared_tags}
+            for related_id, score, shared_tags in ranked if related_id in by_id
+        ]
+        
+        return jsonify({
+            'article_id': article_id,
+            'related': related_data
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 # POST create new article
 @articles_bp.route('/articles', methods=['POST'])
 def create_article():
@@ -134,25 +228,25 @@ def create_article():
         )
         
         db.session.add(new_article)
+        
+        # Handle tags if provided; article and tags commit together
+        tags = resolve_tags(data.get('tag_ids') or [])
+        if tags:
+            db.session.flush()  # assigns new_article.id
+            write_article_tags(new_article.id, set(), tags)
+        tag_data = [TAG_REF.dump(tag) for tag in tags]
         db.session.commit()
         
-        # Handle tags if provided
-        if 'tag_ids' in data:
-            for tag_id in data['tag_ids']:
-                tag = Tag.query.get(tag_id)
-                if tag:
-                    new_article.tags.append(tag)
-            db.session.commit()
+        cache.invalidate(
+            'articles',
+            f'category:{new_article.category_id}',
+            *[f"tag:{tag['id']}" for tag in tag_data]
+        )
+        suggestions().put('articles', new_article.id, new_article.title)
         
         return jsonify({
             'message': 'Article created successfully',
-            'article': {
-                'id': new_article.id,
-                'title': new_article.title,
-                'author_id': new_article.author_id,
-                'category_id': new_article.category_id,
-                'tags': [{'id': tag.id, 'name': tag.name} for tag in new_article.tags]
-            }
+            'article': {**ARTICLE_CREATED.dump(new_article), 'tags': tag_data}
         }), 201
         
     except Exception as e:
@@ -169,6 +263,17 @@ def update_article(article_id):
         if not data:
             return jsonify({'error': 'No data provided'}), 400
         
+        # Tags before this change, read as ids only
+        old_tag_ids = current_tag_ids(article_id)
+        
+        # Cached views showing the article before this change
+        stale_tags = {
+            'articles',
+            f'article:{article_id}',
+            f'category:{article.category_id}',
+            *[f'tag:{tag_id}' for tag_id in old_tag_ids]
+        }
+        
         # Update fields if provided
         if 'title' in data:
             article.title = data['title']
@@ -180,28 +285,31 @@ def update_article(article_id):
                 return jsonify({'error': 'Category not found'}), 404
             article.category_id = data['category_id']
         
-        # Update tags if provided
-        if 'tag_ids' in data:
-            article.tags.clear()  # Remove existing tags
-            for tag_id in data['tag_ids']:
-                tag = Tag.query.get(tag_id)
-                if tag:
-                    article.tags.append(tag)
+        # Set in Python: CURRENT_TIMESTAMP has one-second precision on
+        # SQLite, and validators must tell apart updates within a second
+        article.updated_at = datetime.utcnow()
         
-        article.updated_at = db.func.now()
+        # Update tags if provided, writing only the difference
+        if 'tag_ids' in data:
+            tags = resolve_tags(data['tag_ids'] or [])
+            write_article_tags(article_id, old_tag_ids, tags)
+        else:
+            tags = article.tags
+        tag_data = [TAG_REF.dump(tag) for tag in tags]
         
         db.session.commit()
         
+        cache.invalidate(
+            *stale_tags,
+            f'category:{article.category_id}',
+            *[f"tag:{tag['id']}" for tag in tag_data]
+        )
+        if 'title' in data:
+            suggestions().put('articles', article.id, article.title)
+        
         return jsonify({
             'message': 'Article updated successfully',
-            'article': {
-                'id': article.id,
-                'title': article.title,
-                'content': article.content,
-                'category_id': article.category_id,
-                'tags': [{'id': tag.id, 'name': tag.name} for tag in article.tags],
-                'updated_at': article.updated_at.isoformat()
-            }
+            'article': {**ARTICLE_UPDATED.dump(article), 'tags': tag_data}
         }), 200
         
     except Exception as e:
@@ -213,10 +321,20 @@ def update_article(article_id):
 def delete_article(article_id):
     try:
         article = Article.query.get_or_404(article_id)
+        stale_tags = [
+            'articles',
+            f'article:{article_id}',
+            f'category:{article.category_id}',
+            f'feedback:{article_id}',
+            *[f'tag:{tag.id}' for tag in article.tags]
+        ]
         
         db.session.delete(article)
         db.session.commit()
         
+        cache.invalidate(*stale_tags)
+        suggestions().discard('articles', article_id)
+        
         return jsonify({
             'message': 'Article deleted successfully',
             'deleted_article_id': article_id
@@ -228,29 +346,26 @@ def delete_article(article_id):
 
 # GET articles by tag
 @articles_bp.route('/articles/tag/<string:tag_name>', methods=['GET'])
+@cached()
 def get_articles_by_tag(tag_name):
     try:
         tag = Tag.query.filter_by(name=tag_name).first()
         if not tag:
             return jsonify({'error': 'Tag not found'}), 404
+        add_cache_tags(f'tag:{tag.id}')
         
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 10, type=int)
         
-        articles = Article.query.join(Article.tags).filter(Tag.id == tag.id)\
+        articles = articles_query('by_tag').join(Article.tags).filter(Tag.id == tag.id)\
                                .order_by(Article.created_at.desc())\
                                .paginate(page=page, per_page=per_page, error_out=False)
         
+        dump = ARTICLE_SUMMARY.dumper()
         articles_data = []
         for article in articles.items:
-            articles_data.append({
-                'id': article.id,
-                'title': article.title,
-                'excerpt': article.content[:100] + '...' if len(article.content) > 100 else article.content,
-                'author': article.author.username,
-                'category': article.category.name,
-                'created_at': article.created_at.isoformat()
-            })
+            add_cache_tags(f'user:{article.author_id}')
+            articles_data.append(dump(article))
         
         return jsonify({
             'tag': tag_name,
@@ -261,4 +376,43 @@ def get_articles_by_tag(tag_name):
         }), 200
         
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
\ No newline at end of file
+        return jsonify({'error': str(e)}), 500
+
+# POST bulk import from an NDJSON request body
+@articles_bp.route('/articles/bulk', methods=['POST'])
+def bulk_import_articles():
+    try:
+        chunk_size = request.args.get('chunk_size', DEFAULT_CHUNK_SIZE, type=int)
+        if chunk_size < 1:
+            return jsonify({'error': 'chunk_size must be positive'}), 400
+        
+        # Read the body line by line instead of buffering it
+        summary = import_articles(request.stream, chunk_size)
+        
+        if summary['imported']:
+            cache.invalidate(
+                'articles', 'categories', 'tags',
+                *[f'category:{category_id}' for category_id in summary['category_ids']],
+                *[f'tag:{tag_id}' for tag_id in summary['tag_ids']]
+            )
+            # New titles and tags; rebuilt on next use
+            suggestions().expire()
+        
+        return jsonify({
+            'message': 'Bulk import finished',
+            'imported': summary['imported'],
+            'failed': summary['failed'],
+            'errors': summary['errors']
+        }), 200 if not summary['failed'] else 207
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+# GET all articles as streamed NDJSON
+@articles_bp.route('/articles/export', methods=['GET'])
+def export_all_articles():
+    try:
+        return stream_ndjson(export_articles(), filename='articles.ndjson')
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
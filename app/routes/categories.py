@@ -1,23 +1,26 @@
 from flask import Blueprint, jsonify
-from app.models import Category
+from app.queries import categories_with_counts
+from app.cache import cached, add_cache_tags
+from app.serializers import CATEGORY
+from app.streaming import execute_streaming, stream_json_array
 
 categories_bp = Blueprint('categories', __name__)
 
 @categories_bp.route('/categories', methods=['GET'])
+@cached('categories')
 def get_categories():
     try:
-        categories = Category.query.all()
+        # Executed here, so database errors return a 500 before streaming
+        # starts; rows then come from a server-side cursor as they are encoded
+        categories = execute_streaming(categories_with_counts().options(*CATEGORY.loader_options()))
+        dump = CATEGORY.dumper()
         
-        categories_data = []
-        for category in categories:
-            categories_data.append({
-                'id': category.id,
-                'name': category.name,
-                'description': category.description,
-                'article_count': len(category.articles)
-            })
+        def serialize(row):
+            category, article_count = row
+            add_cache_tags(f'category:{category.id}')
+            return {**dump(category), 'article_count': article_count}
         
-        return jsonify(categories_data), 200
+        return stream_json_array(categories, serialize)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
\ No newline at end of file
@@ -1,56 +1,78 @@
 from flask import Blueprint, jsonify, request
-from app.models import Feedback, Article, User
-from app import db
-from datetime import datetime
+from app.models import Feedback, Article, User, FeedbackStats
+from app import db, cache
+from app.cache import cached
+from app.queries import feedback_query
+from app.serializers import FEEDBACK_BY_ARTICLE, FEEDBACK_BY_USER
+from app.pagination import InvalidCursor, keyset_paginate, cursor_meta
+from app.feedback_stats import article_stats, summarize, rollup_counts, record_feedback, retract_feedback
+from sqlalchemy.orm import load_only
 
 feedback_bp = Blueprint('feedback', __name__)
 
+# Upper bound on articles per batch summary request
+MAX_BATCH_SUMMARIES = 500
+
+def summary_data(article_id, article_title, stats):
+    """Public summary payload for one article from its feedback stats."""
+    if stats['total_feedback'] == 0:
+        return {
+            'article_id': article_id,
+            'total_feedback': 0,
+            'average_score': 0,
+            'score_breakdown': stats['score_breakdown'],
+            'message': 'No feedback yet'
+        }
+    
+    return {
+        'article_id': article_id,
+        'article_title': article_title,
+        'total_feedback': stats['total_feedback'],
+        'average_score': stats['average_score'],
+        'score_breakdown': stats['score_breakdown'],
+        'positive_percentage': stats['positive_percentage']
+    }
+
 # GET all feedback for an article (admin/moderator view)
 @feedback_bp.route('/articles/<int:article_id>/feedback', methods=['GET'])
 def get_article_feedback(article_id):
     try:
         # Verify article exists
-        article = Article.query.get_or_404(article_id)
+        article = Article.query.options(load_only(Article.title)).get_or_404(article_id)
         
         # Get pagination parameters
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 20, type=int)
+        cursor = request.args.get('cursor')  # opt-in keyset mode
         
-        feedback_query = Feedback.query.filter_by(article_id=article_id)
+        query = feedback_query('by_article').filter_by(article_id=article_id)
         
         # Filter by helpfulness score if provided
         min_score = request.args.get('min_score', type=int)
         if min_score is not None:
-            feedback_query = feedback_query.filter(Feedback.helpfulness_score >= min_score)
-        
-        feedback = feedback_query.order_by(Feedback.created_at.desc()).paginate(
-            page=page, per_page=per_page, error_out=False
-        )
-        
-        feedback_data = []
-        for entry in feedback.items:
-            feedback_entry = {
-                'id': entry.id,
-                'helpfulness_score': entry.helpfulness_score,
-                'comment': entry.comment,
-                'created_at': entry.created_at.isoformat(),
-                'is_anonymous': entry.user_id is None
+            query = query.filter(Feedback.helpfulness_score >= min_score)
+        
+        if cursor is not None:
+            items, next_cursor = keyset_paginate(query, Feedback, cursor, per_page)
+            pagination = cursor_meta(query, next_cursor, per_page)
+        else:
+            feedback = query.order_by(Feedback.created_at.desc()).paginate(
+                page=page, per_page=per_page, error_out=False
+            )
+            items = feedback.items
+            pagination = {
+                'page': page,
+                'per_page': per_page,
+                'total': feedback.total,
+                'pages': feedback.pages
             }
-            
-            # Include username if not anonymous
-            if entry.user_id:
-                feedback_entry['user'] = {
-                    'id': entry.user.id,
-                    'username': entry.user.username
-                }
-            
-            feedback_data.append(feedback_entry)
+        
+        # Anonymous entries carry no 'user' key
+        dump = FEEDBACK_BY_ARTICLE.dumper()
+        feedback_data = [dump(entry) for entry in items]
         
         # Calculate article feedback statistics
-        total_feedback = Feedback.query.filter_by(article_id=article_id).count()
-        avg_score = db.session.query(db.func.avg(Feedback.helpfulness_score))\
-                            .filter_by(article_id=article_id)\
-                            .scalar() or 0
+        stats = article_stats(article_id)
         
         return jsonify({
             'article': {
@@ -59,21 +81,15 @@ def get_article_feedback(article_id):
             },
             'feedback': feedback_data,
             'statistics': {
-                'total_feedback': total_feedback,
-                'average_score': round(float(avg_score), 2),
-                'positive_feedback': Feedback.query.filter(
-                    Feedback.article_id == article_id,
-                    Feedback.helpfulness_score >= 4
-                ).count()
+                'total_feedback': stats['total_feedback'],
+                'average_score': stats['average_score'],
+                'positive_feedback': stats['positive_feedback']
             },
-            'pagination': {
-                'page': page,
-                'per_page': per_page,
-                'total': feedback.total,
-                'pages': feedback.pages
-            }
+            'pagination': pagination
         }), 200
         
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -118,8 +134,14 @@ def submit_feedback(article_id):
         )
         
         db.session.add(new_feedback)
+        db.session.flush()
+        
+        # Keep the rollup in the same transaction as the feedback row
+        record_feedback(article_id, score, new_feedback.created_at)
         db.session.commit()
         
+        cache.invalidate(f'feedback:{article_id}')
+        
         response_data = {
             'message': 'Feedback submitted successfully',
             'feedback_id': new_feedback.id,
@@ -139,46 +161,70 @@ def submit_feedback(article_id):
 
 # GET feedback summary for an article (public view)
 @feedback_bp.route('/articles/<int:article_id>/feedback/summary', methods=['GET'])
+@cached('feedback:{article_id}', 'article:{article_id}')
 def get_feedback_summary(article_id):
     try:
-        # Verify article exists
-        article = Article.query.get_or_404(article_id)
+        # Title and rollup row in one primary-key lookup
+        row = db.session.query(Article.title, FeedbackStats)\
+                        .outerjoin(FeedbackStats, FeedbackStats.article_id == Article.id)\
+                        .filter(Article.id == article_id)\
+                        .first()
+        if row is None:
+            return jsonify({'error': 'Article not found'}), 404
         
-        # Calculate statistics
-        total_feedback = Feedback.query.filter_by(article_id=article_id).count()
+        article_title, rollup = row
+        stats = summarize(rollup_counts(rollup))
         
-        if total_feedback == 0:
-            return jsonify({
-                'article_id': article_id,
-                'total_feedback': 0,
-                'average_score': 0,
-                'score_breakdown': {1: 0, 2: 0, 3: 0, 4: 0, 5: 0},
-                'message': 'No feedback yet'
-            }), 200
+        return jsonify(summary_data(article_id, article_title, stats)), 200
         
-        avg_score = db.session.query(db.func.avg(Feedback.helpfulness_score))\
-                            .filter_by(article_id=article_id)\
-                            .scalar()
-        
-        # Get score breakdown
-        score_breakdown = {}
-        for score in range(1, 6):
-            count = Feedback.query.filter_by(
-                article_id=article_id, 
-                helpfulness_score=score
-            ).count()
-            score_breakdown[score] = count
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# GET/POST feedback summaries for many articles at once
+@feedback_bp.route('/feedback/summary', methods=['GET', 'POST'])
+def get_feedback_summaries():
+    try:
+        # ?article_ids=1,2,3 or a JSON body {"article_ids": [...]} for long lists
+        if request.method == 'POST':
+            data = request.get_json(silent=True)
+            raw_ids = data.get('article_ids') if isinstance(data, dict) else None
+            # bool is an int subclass, but true is not an id
+            if not isinstance(raw_ids, list) or not all(
+                isinstance(i, int) and not isinstance(i, bool) for i in raw_ids
+            ):
+                return jsonify({'error': 'article_ids must be a list of integers'}), 400
+        else:
+            try:
+                raw_ids = [int(i) for i in request.args.get('article_ids', '').split(',') if i.strip()]
+            except ValueError:
+                return jsonify({'error': 'article_ids must be a comma-separated list of integers'}), 400
+        
+        article_ids = list(dict.fromkeys(raw_ids))
+        
+        if not article_ids:
+            return jsonify({'error': 'article_ids is required'}), 400
+        if len(article_ids) > MAX_BATCH_SUMMARIES:
+            return jsonify({
+                'error': f'At most {MAX_BATCH_SUMMARIES} article_ids per request'
+            }), 400
+        
+        # Titles and rollup rows for every requested article in one query
+        rows = db.session.query(Article.id, Article.title, FeedbackStats)\
+                         .outerjoin(FeedbackStats, FeedbackStats.article_id == Article.id)\
+                         .filter(Article.id.in_(article_ids))\
+                         .all()
+        found = {article_id: (title, rollup) for article_id, title, rollup in rows}
+        
+        summaries = []
+        for article_id in article_ids:
+            if article_id in found:
+                title, rollup = found[article_id]
+                stats = summarize(rollup_counts(rollup))
+                summaries.append(summary_data(article_id, title, stats))
         
         return jsonify({
-            'article_id': article_id,
-            'article_title': article.title,
-            'total_feedback': total_feedback,
-            'average_score': round(float(avg_score), 2),
-            'score_breakdown': score_breakdown,
-            'positive_percentage': round(
-                (score_breakdown[4] + score_breakdown[5]) / total_feedback * 100, 
-                2
-            )
+            'summaries': summaries,
+            'missing_article_ids': [i for i in article_ids if i not in found]
         }), 200
         
     except Exception as e:
@@ -192,24 +238,28 @@ def get_user_feedback(user_id):
         
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 10, type=int)
+        cursor = request.args.get('cursor')  # opt-in keyset mode
+        
+        query = feedback_query('by_user').filter_by(user_id=user_id)
+        if cursor is not None:
+            items, next_cursor = keyset_paginate(query, Feedback, cursor, per_page)
+        else:
+            feedback = query.order_by(Feedback.created_at.desc())\
+                            .paginate(page=page, per_page=per_page, error_out=False)
+            items = feedback.items
         
-        feedback = Feedback.query.filter_by(user_id=user_id)\
-                               .order_by(Feedback.created_at.desc())\
-                               .paginate(page=page, per_page=per_page, error_out=False)
-        
-        feedback_data = []
-        for entry in feedback.items:
-            feedback_data.append({
-                'id': entry.id,
-                'article': {
-                    'id': entry.article.id,
-                    'title': entry.article.title,
-                    'category': entry.article.category.name
+        dump = FEEDBACK_BY_USER.dumper()
+        feedback_data = [dump(entry) for entry in items]
+        
+        if cursor is not None:
+            return jsonify({
+                'user': {
+                    'id': user.id,
+                    'username': user.username
                 },
-                'helpfulness_score': entry.helpfulness_score,
-                'comment': entry.comment,
-                'created_at': entry.created_at.isoformat()
-            })
+                'feedback': feedback_data,
+                **cursor_meta(query, next_cursor, per_page)
+            }), 200
         
         return jsonify({
             'user': {
@@ -223,6 +273,8 @@ def get_user_feedback(user_id):
             'pages': feedback.pages
         }), 200
         
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -232,9 +284,14 @@ def delete_feedback(feedback_id):
     try:
         feedback = Feedback.query.get_or_404(feedback_id)
         
+        article_id = feedback.article_id
+        
+        retract_feedback(article_id, feedback.helpfulness_score, feedback_id)
         db.session.delete(feedback)
         db.session.commit()
         
+        cache.invalidate(f'feedback:{article_id}')
+        
         return jsonify({
             'message': 'Feedback deleted successfully',
             'deleted_feedback_id': feedback_id
@@ -1,4 +1,7 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, current_app, jsonify
+from app import cache, db
+from app.db_pool import pool_stats
+from app.metrics import PROMETHEUS_MIMETYPE
 
 main_bp = Blueprint('main', __name__)
 
@@ -13,59 +16,51 @@ def home():
                 'POST_create': '/articles (POST)',
                 'PUT_update': '/articles/1 (PUT)',
                 'DELETE': '/articles/1 (DELETE)',
-                'by_tag': '/articles/tag/python'
+                'by_tag': '/articles/tag/python',
+                'related': '/articles/1/related',
+                'POST_bulk': '/articles/bulk (POST, NDJSON)',
+                'export': '/articles/export'
             },
             'categories': '/categories',
+            'metrics': '/metrics',
+            'suggest': '/suggest?q=pyt',
             'tags': '/tags',
             'users': {
                 'GET_all': '/users',
                 'GET_single': '/users/1',
                 'register': '/register (POST)',
-                'login': '/login (POST)'
+                'login': '/login (POST)',
+                'profile': '/profile (Bearer token)'
             },
             'feedback': {
                 'GET_article_feedback': '/articles/1/feedback',
                 'POST_feedback': '/articles/1/feedback (POST)',
-                'GET_summary': '/articles/1/feedback/summary'
+                'GET_summary': '/articles/1/feedback/summary',
+                'GET_batch_summary': '/feedback/summary?article_ids=1,2,3'
             }
         },
         'version': '1.0'
     })
 
 
-@main_bp.route('/setup-database', methods=['POST'])
-def setup_database():
-    """One-time database setup route"""
-    try:
-        from app import db
-        from app.models import User
-        
-        print("🔄 Creating database tables...")
-        db.create_all()
-        print("✅ Tables created")
-        
-        # Check if already seeded
-        if User.query.first() is not None:
-            return jsonify({'message': 'Database already contains data'}), 200
-        
-        print("🔄 Seeding data...")
-        # Add your seeding logic here or import from seed.py
-        # For now, just create a test user
-        from werkzeug.security import generate_password_hash
-        user = User(
-            username="admin", 
-            email="admin@example.com", 
-            password_hash=generate_password_hash("password123"),
-            role="admin"
-        )
-        db.session.add(user)
-        db.session.commit()
-        
-        return jsonify({
-            'message': 'Database setup completed successfully',
-            'tables_created': True,
-            'data_seeded': True
-        }), 200
-        
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
\ No newline at end of file
+@main_bp.route('/internal/cache', methods=['GET'])
+def cache_stats():
+    """Response cache hit/miss/eviction counters for this worker"""
+    return jsonify(cache.stats())
+
+
+@main_bp.route('/internal/db-pool', methods=['GET'])
+def db_pool_stats():
+    """Connection pool occupancy and checkout wait times for this worker"""
+    engine_options = current_app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {})
+    return jsonify(pool_stats(db.engine, engine_options.get('max_overflow')))
+
+
+@main_bp.route('/metrics', methods=['GET'])
+def metrics():
+    """Per-blueprint request histograms for this worker, in Prometheus text format"""
+    extension = current_app.extensions.get('metrics')
+    if extension is None:
+        return jsonify({'error': 'Metrics are disabled'}), 404
+    return current_app.response_class(extension.render(), mimetype=PROMETHEUS_MIMETYPE)
+
@@ -0,0 +1,32 @@
+from flask import Blueprint, jsonify, request
+from app.suggest import suggestions, SOURCES, DEFAULT_LIMIT, MAX_LIMIT
+
+suggest_bp = Blueprint('suggest', __name__)
+
+# GET typeahead suggestions: tags, categories and article titles starting with ?q=
+@suggest_bp.route('/suggest', methods=['GET'])
+def get_suggestions():
+    try:
+        prefix = request.args.get('q', '', type=str).strip()
+        limit = min(max(request.args.get('limit', DEFAULT_LIMIT, type=int), 1), MAX_LIMIT)
+        
+        if not prefix:
+            return jsonify({'query': prefix, **{kind: [] for kind in SOURCES}}), 200
+        
+        matches = suggestions().search(prefix, limit)
+        
+        return jsonify({
+            'query': prefix,
+            **{
+                kind: [{'id': id_, SOURCES[kind][2]: text} for id_, text in matches[kind]]
+                for kind in SOURCES
+            }
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# GET prefix index state for this worker
+@suggest_bp.route('/internal/suggest', methods=['GET'])
+def suggest_stats():
+    return jsonify(suggestions().stats())
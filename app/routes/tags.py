@@ -1,22 +1,26 @@
 from flask import Blueprint, jsonify
-from app.models import Tag
+from app.queries import tags_with_counts
+from app.cache import cached, add_cache_tags
+from app.serializers import TAG_REF
+from app.streaming import execute_streaming, stream_json_array
 
 tags_bp = Blueprint('tags', __name__)
 
 @tags_bp.route('/tags', methods=['GET'])
+@cached('tags')
 def get_tags():
     try:
-        tags = Tag.query.all()
+        # Executed here, so database errors return a 500 before streaming
+        # starts; rows then come from a server-side cursor as they are encoded
+        tags = execute_streaming(tags_with_counts().options(*TAG_REF.loader_options()))
+        dump = TAG_REF.dumper()
         
-        tags_data = []
-        for tag in tags:
-            tags_data.append({
-                'id': tag.id,
-                'name': tag.name,
-                'article_count': len(tag.articles)
-            })
+        def serialize(row):
+            tag, article_count = row
+            add_cache_tags(f'tag:{tag.id}')
+            return {**dump(tag), 'article_count': article_count}
         
-        return jsonify(tags_data), 200
+        return stream_json_array(tags, serialize)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
\ No newline at end of file
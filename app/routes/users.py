@@ -1,8 +1,14 @@
+from datetime import datetime
 from flask import Blueprint, jsonify, request
 from app.models import User, Article
-from app import db
-from werkzeug.security import generate_password_hash, check_password_hash
-from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity  # NEW
+from app import db, cache
+from app.queries import users_query, users_with_counts
+from app.serializers import USER_DETAIL, USER_LIST
+from app.streaming import execute_streaming, stream_json_array
+from app.passwords import HashingBusy, busy_response, passwords
+from app.auth import access_token_for, principals
+from app.firebase_sync import SyncConflict, sync_user
+from flask_jwt_extended import jwt_required, get_jwt_identity  # NEW
 
 users_bp = Blueprint('users', __name__)
 
@@ -15,72 +21,30 @@ def sync_firebase_user():
         # Required fields from Firebase
         firebase_uid = data.get('firebase_uid')
         email = data.get('email')
-        username = data.get('username')
         
         if not firebase_uid or not email:
             return jsonify({'error': 'Firebase UID and email are required'}), 400
         
-        # Check if user already exists by Firebase UID
-        user = User.query.filter_by(firebase_uid=firebase_uid).first()
-        
-        if user:
-            # User exists, return their data
-            access_token = create_access_token(identity=user.id)
-            return jsonify({
-                'message': 'User synced successfully',
-                'access_token': access_token,
-                'user': {
-                    'id': user.id,
-                    'username': user.username,
-                    'email': user.email,
-                    'role': user.role
-                }
-            }), 200
-        
-        # Check if user exists by email (for existing users)
-        user = User.query.filter_by(email=email).first()
-        if user:
-            # Link Firebase UID to existing user
-            user.firebase_uid = firebase_uid
-            db.session.commit()
-        else:
-            # Create new user from Firebase data
-            if not username:
-                # Generate username from email
-                username = email.split('@')[0]
-            
-            # Ensure username is unique
-            base_username = username
-            counter = 1
-            while User.query.filter_by(username=username).first():
-                username = f"{base_username}{counter}"
-                counter += 1
-            
-            new_user = User(
-                username=username,
-                email=email,
-                firebase_uid=firebase_uid,
-                password_hash='firebase_auth',  # Dummy value
-                role='employee'
-            )
-            db.session.add(new_user)
-            db.session.commit()
-            user = new_user
+        # One lookup for returning users; link by email or create otherwise
+        user = sync_user(firebase_uid, email, data.get('username'))
         
         # Create JWT token for your backend
-        access_token = create_access_token(identity=user.id)
+        access_token = access_token_for(user['id'], user['username'], user['role'])
         
         return jsonify({
             'message': 'User synced successfully',
             'access_token': access_token,
             'user': {
-                'id': user.id,
-                'username': user.username,
-                'email': user.email,
-                'role': user.role
+                'id': user['id'],
+                'username': user['username'],
+                'email': user['email'],
+                'role': user['role']
             }
         }), 200
         
+    except SyncConflict:
+        db.session.rollback()
+        return jsonify({'error': 'Account is being updated concurrently, please retry'}), 409
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
@@ -90,21 +54,13 @@ def sync_firebase_user():
 @jwt_required()
 def get_profile():
     try:
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        # Cached profile; no users-table query while the entry is fresh
+        user = principals().get(get_jwt_identity())
         
         if not user:
             return jsonify({'error': 'User not found'}), 404
             
-        return jsonify({
-            'user': {
-                'id': user.id,
-                'username': user.username,
-                'email': user.email,
-                'role': user.role,
-                'firebase_uid': user.firebase_uid
-            }
-        }), 200
+        return jsonify({'user': user}), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -113,20 +69,16 @@ def get_profile():
 @users_bp.route('/users', methods=['GET'])
 def get_users():
     try:
-        users = User.query.all()
+        # Executed here, so database errors return a 500 before streaming
+        # starts; rows then come from a server-side cursor as they are encoded
+        users = execute_streaming(users_with_counts().options(*USER_LIST.loader_options()))
+        dump = USER_LIST.dumper()
         
-        users_data = []
-        for user in users:
-            users_data.append({
-                'id': user.id,
-                'username': user.username,
-                'email': user.email,
-                'role': user.role,
-                'article_count': len(user.articles),
-                'created_at': user.created_at.isoformat()
-            })
+        def serialize(row):
+            user, article_count = row
+            return {**dump(user), 'article_count': article_count}
         
-        return jsonify(users_data), 200
+        return stream_json_array(users, serialize)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -135,23 +87,9 @@ def get_users():
 @users_bp.route('/users/<int:user_id>', methods=['GET'])
 def get_user(user_id):
     try:
-        user = User.query.get_or_404(user_id)
+        user = users_query('detail').get_or_404(user_id)
         
-        user_data = {
-            'id': user.id,
-            'username': user.username,
-            'email': user.email,
-            'role': user.role,
-            'created_at': user.created_at.isoformat(),
-            'articles': [
-                {
-                    'id': article.id,
-                    'title': article.title,
-                    'category': article.category.name,
-                    'created_at': article.created_at.isoformat()
-                } for article in user.articles
-            ]
-        }
+        user_data = USER_DETAIL.dump(user)
         
         return jsonify(user_data), 200
         
@@ -179,7 +117,7 @@ def register_user():
         new_user = User(
             username=data['username'],
             email=data['email'],
-            password_hash=generate_password_hash(data['password']),
+            password_hash=passwords().hash(data['password']),
             role=data.get('role', 'employee')
         )
         
@@ -196,6 +134,9 @@ def register_user():
             }
         }), 201
         
+    except HashingBusy:
+        db.session.rollback()
+        return busy_response()
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
@@ -211,11 +152,20 @@ def login_user():
         
         user = User.query.filter_by(username=data['username']).first()
         
-        if not user or not check_password_hash(user.password_hash, data['password']):
+        if not user:
             return jsonify({'error': 'Invalid username or password'}), 401
         
+        valid, new_hash = passwords().verify(user.password_hash, data['password'])
+        if not valid:
+            return jsonify({'error': 'Invalid username or password'}), 401
+        
+        # Stored hash predates the current PASSWORD_HASH_METHOD; upgrade it
+        if new_hash:
+            user.password_hash = new_hash
+            db.session.commit()
+        
         # Create JWT token
-        access_token = create_access_token(identity=user.id)
+        access_token = access_token_for(user.id, user.username, user.role)
         
         return jsonify({
             'message': 'Login successful',
@@ -228,7 +178,10 @@ def login_user():
             }
         }), 200
         
+    except HashingBusy:
+        return busy_response()
     except Exception as e:
+        db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
 # PUT update user profile
@@ -251,10 +204,23 @@ def update_user(user_id):
             user.email = data['email']
         
         if 'password' in data:
-            user.password_hash = generate_password_hash(data['password'])
+            user.password_hash = passwords().hash(data['password'])
+        
+        # Article payloads embed the author's username and email: move their
+        # updated_at so ETag/Last-Modified validators see the change
+        if 'username' in data or 'email' in data:
+            db.session.execute(
+                db.update(Article)
+                .where(Article.author_id == user_id)
+                .values(updated_at=datetime.utcnow())
+            )
         
         db.session.commit()
         
+        # Article payloads embed the author's username and email
+        cache.invalidate('articles', f'user:{user_id}')
+        principals().invalidate(user_id)
+        
         return jsonify({
             'message': 'User updated successfully',
             'user': {
@@ -265,6 +231,9 @@ def update_user(user_id):
             }
         }), 200
         
+    except HashingBusy:
+        db.session.rollback()
+        return busy_response()
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
\ No newline at end of file
@@ -0,0 +1,160 @@
+# app/search.py
+# Full-text search for articles.
+#
+# SQLite uses an external-content FTS5 table (articles_fts) kept in sync by
+# triggers on the articles table. PostgreSQL uses a generated tsvector column
+# (articles.search_vector) with a GIN index. Both are maintained by the
+# database itself, so every write path (ORM, bulk inserts, raw SQL) stays in
+# sync without any application code. Other engines fall back to ILIKE.
+import html
+import re
+
+from sqlalchemy import DDL, event
+
+from app import db
+from app.models import Article
+
+HIGHLIGHT_START = '<mark>'
+HIGHLIGHT_END = '</mark>'
+
+# The database wraps matches in these private-use characters; the snippet
+# is HTML-escaped before they are replaced with the <mark> tags
+MATCH_START = '\ue000'
+MATCH_END = '\ue001'
+
+SQLITE_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5("
+    "title, content, content='articles', content_rowid='id', "
+    "tokenize='porter unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS articles_fts_ai AFTER INSERT ON articles BEGIN "
+    "INSERT INTO articles_fts(rowid, title, content) "
+    "VALUES (new.id, new.title, new.content); END",
+    "CREATE TRIGGER IF NOT EXISTS articles_fts_ad AFTER DELETE ON articles BEGIN "
+    "INSERT INTO articles_fts(articles_fts, rowid, title, content) "
+    "VALUES ('delete', old.id, old.title, old.content); END",
+    "CREATE TRIGGER IF NOT EXISTS articles_fts_au AFTER UPDATE OF title, content ON articles BEGIN "
+    "INSERT INTO articles_fts(articles_fts, rowid, title, content) "
+    "VALUES ('delete', old.id, old.title, old.content); "
+    "INSERT INTO articles_fts(rowid, title, content) "
+    "VALUES (new.id, new.title, new.content); END",
+    "INSERT INTO articles_fts(articles_fts) VALUES ('rebuild')",
+]
+
+SQLITE_DROP_DDL = [
+    "DROP TABLE IF EXISTS articles_fts",
+]
+
+POSTGRES_DDL = [
+    "ALTER TABLE articles ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    "GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(content, '')), 'B')"
+    ") STORED",
+    "CREATE INDEX IF NOT EXISTS ix_articles_search_vector "
+    "ON articles USING GIN (search_vector)",
+]
+
+POSTGRES_DROP_DDL = [
+    "DROP INDEX IF EXISTS ix_articles_search_vector",
+    "ALTER TABLE articles DROP COLUMN IF EXISTS search_vector",
+]
+
+# Keep the index alongside tables built with db.create_all()
+for statement in SQLITE_DDL:
+    event.listen(Article.__table__, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
+for statement in POSTGRES_DDL:
+    event.listen(Article.__table__, 'after_create', DDL(statement).execute_if(dialect='postgresql'))
+for statement in SQLITE_DROP_DDL:
+    event.listen(Article.__table__, 'before_drop', DDL(statement).execute_if(dialect='sqlite'))
+
+
+def _terms(text):
+    """Split user input into plain word tokens safe for any FTS syntax."""
+    return re.findall(r'\w+', text or '')
+
+
+def _mark_matches(snippet):
+    """HTML-escape `snippet`, then turn the match delimiters into <mark> tags."""
+    return html.escape(snippet)\
+               .replace(MATCH_START, HIGHLIGHT_START)\
+               .replace(MATCH_END, HIGHLIGHT_END)
+
+
+def _dialect():
+    return db.session.get_bind().dialect.name
+
+
+def apply_search(query, text):
+    """Restrict an Article query to matches for `text`, best matches first.
+
+    Terms are prefix-matched so partial words typed into the search box
+    still hit. Returns the query unchanged when `text` has no searchable terms.
+    """
+    terms = _terms(text)
+    if not terms:
+        return query
+
+    dialect = _dialect()
+    if dialect == 'sqlite':
+        match = ' '.join(f'"{term}"*' for term in terms)
+        matches = db.select(
+            db.literal_column('rowid').label('article_id'),
+            db.literal_column('rank').label('rank')
+        ).select_from(db.table('articles_fts')).where(
+            db.text('articles_fts MATCH :match').bindparams(match=match)
+        ).subquery()
+        return query.join(matches, matches.c.article_id == Article.id)\
+                    .order_by(matches.c.rank)
+
+    if dialect == 'postgresql':
+        ts_query = db.func.to_tsquery('english', ' & '.join(f'{term}:*' for term in terms))
+        search_vector = db.literal_column('articles.search_vector')
+        return query.filter(search_vector.op('@@')(ts_query))\
+                    .order_by(db.func.ts_rank_cd(search_vector, ts_query).desc())
+
+    # Unknown engine: plain substring match
+    for term in terms:
+        query = query.filter(
+            db.or_(
+                Article.title.ilike(f'%{term}%'),
+                Article.content.ilike(f'%{term}%')
+            )
+        )
+    return query
+
+
+def highlight(article_ids, text):
+    """Return {article_id: snippet} with matched terms wrapped in <mark> tags.
+
+    Snippets are HTML-escaped, so the marks are the only markup in them.
+    Only called for the articles on the current page, so the cost of building
+    snippets does not grow with the size of the corpus.
+    """
+    terms = _terms(text)
+    if not terms or not article_ids:
+        return {}
+
+    dialect = _dialect()
+    if dialect == 'sqlite':
+        match = ' '.join(f'"{term}"*' for term in terms)
+        rows = db.session.execute(
+            db.text(
+                "SELECT rowid, snippet(articles_fts, -1, :start, :end, '...', 24) "
+                "FROM articles_fts WHERE articles_fts MATCH :match "
+                "AND rowid IN :ids"
+            ).bindparams(db.bindparam('ids', expanding=True)),
+            {'start': MATCH_START, 'end': MATCH_END,
+             'match': match, 'ids': list(article_ids)}
+        )
+        return {row[0]: _mark_matches(row[1]) for row in rows}
+
+    if dialect == 'postgresql':
+        ts_query = db.func.to_tsquery('english', ' & '.join(f'{term}:*' for term in terms))
+        options = f'StartSel={MATCH_START}, StopSel={MATCH_END}, MaxWords=35, MinWords=15'
+        rows = db.session.execute(
+            db.select(Article.id, db.func.ts_headline('english', Article.content, ts_query, options))
+            .where(Article.id.in_(article_ids))
+        )
+        return {row[0]: _mark_matches(row[1]) for row in rows}
+
+    return {}
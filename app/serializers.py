@@ -0,0 +1,311 @@
+# app/serializers.py
+# Declarative views of the models: one definition per response shape drives
+# both serialization and ORM loading.
+#
+# A View lists the fields a response contains. From that single declaration
+# it compiles (and caches, per sparse fieldset) two things:
+#   - a dumper: a flat list of (name, getter) pairs built from attrgetter,
+#     so serializing a row is one dict comprehension with no per-field
+#     lookups or type dispatch;
+#   - loader options: load_only() for exactly the columns the fields read,
+#     with_expression() for SQL-computed fields, and joinedload/selectinload
+#     (with their own nested load_only) for related views.
+# Tuning serialization or loading for an endpoint means editing its View.
+from operator import attrgetter
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import joinedload, load_only, selectinload, with_expression
+
+from app import db
+from app.models import Article, Category, Feedback, Tag, User
+
+
+class Column:
+    """A mapped column, emitted as-is."""
+
+    def __init__(self, attr=None):
+        self.attr = attr
+
+    def bind(self, name):
+        self.attr = self.attr or name
+        return self
+
+    def columns(self):
+        return (self.attr,)
+
+    def getter(self):
+        return attrgetter(self.attr)
+
+    def options(self, model):
+        return ()
+
+
+class Expression(Column):
+    """A query_expression() attribute filled in by SQL when loading."""
+
+    def __init__(self, sql, attr=None):
+        super().__init__(attr)
+        self.sql = sql
+
+    def columns(self):
+        return ()
+
+    def options(self, model):
+        return (with_expression(getattr(model, self.attr), self.sql()),)
+
+
+class Method(Column):
+    """A value computed in Python from the listed columns."""
+
+    def __init__(self, function, columns=()):
+        super().__init__()
+        self.function = function
+        self.needs = tuple(columns)
+
+    def columns(self):
+        return self.needs
+
+    def getter(self):
+        return self.function
+
+
+class Nested(Column):
+    """A relationship rendered through another View (a list for collections)."""
+
+    def __init__(self, view, attr=None, omit_none=False):
+        super().__init__(attr)
+        self.view = view
+        self.omit_none = omit_none
+
+    def columns(self):
+        return ()
+
+    def relationship(self, model):
+        return inspect(model).relationships[self.attr]
+
+    def getter(self):
+        get = attrgetter(self.attr)
+        dump = self.view.dumper()
+        if self.uselist:
+            return lambda obj: [dump(item) for item in get(obj)]
+        return lambda obj: None if get(obj) is None else dump(get(obj))
+
+    def options(self, model):
+        relationship = self.relationship(model)
+        # Collections: one SELECT ... IN per page; many-to-one: a JOIN
+        loader = selectinload if relationship.uselist else joinedload
+        return (loader(getattr(model, self.attr)).options(*self.view.loader_options()),)
+
+    def local_columns(self, model):
+        # Foreign keys on this side of a many-to-one, e.g. articles.author_id
+        relationship = self.relationship(model)
+        if relationship.uselist:
+            return ()
+        return tuple(column.key for column in relationship.local_columns)
+
+
+class Pluck(Nested):
+    """A single field of a related object, e.g. the author's username."""
+
+    def __init__(self, view, field, attr=None):
+        super().__init__(view, attr)
+        self.field = field
+
+    def getter(self):
+        get = attrgetter(self.attr)
+        pluck = attrgetter(self.field)
+        return lambda obj: None if get(obj) is None else pluck(get(obj))
+
+
+class View:
+    """An ordered set of named fields over one model.
+
+    `always` names columns loaded even when no emitted field reads them,
+    e.g. keys used for cursors or cache tags.
+    """
+
+    def __init__(self, model, fields, always=()):
+        self.model = model
+        self.fields = {name: field.bind(name) for name, field in fields.items()}
+        self.always = tuple(always)
+        self.dumpers = {}
+        self.loaders = {}
+        # Resolve relationship kinds up front so dumpers can be compiled
+        for field in self.fields.values():
+            if isinstance(field, Nested):
+                field.uselist = field.relationship(model).uselist
+
+    def select(self, only):
+        if only is None:
+            return self.fields
+        return {name: field for name, field in self.fields.items() if name in only}
+
+    def dumper(self, only=None):
+        """Compiled function turning one object into a dict."""
+        key = frozenset(only) if only is not None else None
+        if key not in self.dumpers:
+            pairs = [(name, field.getter(), getattr(field, 'omit_none', False))
+                     for name, field in self.select(only).items()]
+            if any(omit for _, _, omit in pairs):
+                def dump(obj):
+                    data = {}
+                    for name, get, omit in pairs:
+                        value = get(obj)
+                        if value is not None or not omit:
+                            data[name] = value
+                    return data
+            else:
+                getters = [(name, get) for name, get, _ in pairs]
+
+                def dump(obj):
+                    return {name: get(obj) for name, get in getters}
+            self.dumpers[key] = dump
+        return self.dumpers[key]
+
+    def dump(self, obj, only=None):
+        return self.dumper(only)(obj)
+
+    def loader_options(self, only=None):
+        """ORM options loading exactly what dumper(only) reads."""
+        key = frozenset(only) if only is not None else None
+        if key not in self.loaders:
+            fields = self.select(only)
+            mapper = inspect(self.model)
+            columns = [column.key for column in mapper.primary_key]
+            columns += list(self.always)
+            options = []
+            for field in fields.values():
+                columns += field.columns()
+                if isinstance(field, Nested):
+                    columns += field.local_columns(self.model)
+                options += field.options(self.model)
+            columns = [getattr(self.model, name) for name in dict.fromkeys(columns)]
+            self.loaders[key] = (load_only(*columns), *options)
+        return self.loaders[key]
+
+
+def excerpt(length):
+    """SQL for the first `length` characters of content, '...' appended if cut."""
+    def sql():
+        return db.case(
+            (db.func.length(Article.content) > length,
+             db.func.substr(Article.content, 1, length) + '...'),
+            else_=Article.content
+        )
+    return Expression(sql, attr='excerpt')
+
+
+# --- Shared building blocks ---
+
+USER_REF = View(User, {'id': Column(), 'username': Column()})
+USER_CONTACT = View(User, {'id': Column(), 'username': Column(), 'email': Column()})
+CATEGORY = View(Category, {'id': Column(), 'name': Column(), 'description': Column()})
+CATEGORY_NAME = View(Category, {'name': Column()})
+TAG_REF = View(Tag, {'id': Column(), 'name': Column()})
+
+# --- Articles ---
+
+# GET /articles (content is never loaded; see ?fields=)
+ARTICLE_LIST = View(Article, {
+    'id': Column(),
+    'title': Column(),
+    'excerpt': excerpt(150),
+    'author': Nested(USER_CONTACT),
+    'category': Nested(CATEGORY),
+    'tags': Nested(TAG_REF),
+    'created_at': Column(),
+    'updated_at': Column(),
+}, always=('created_at',))
+
+# GET /articles/<id>
+ARTICLE_DETAIL = View(Article, {
+    'id': Column(),
+    'title': Column(),
+    'content': Column(),
+    'author': Nested(USER_CONTACT),
+    'category': Nested(CATEGORY),
+    'tags': Nested(TAG_REF),
+    'created_at': Column(),
+    'updated_at': Column(),
+})
+
+# GET /articles/tag/<name>
+ARTICLE_SUMMARY = View(Article, {
+    'id': Column(),
+    'title': Column(),
+    'excerpt': excerpt(100),
+    'author': Pluck(USER_REF, 'username'),
+    'category': Pluck(CATEGORY_NAME, 'name'),
+    'created_at': Column(),
+})
+
+# Article rows nested in user-centric responses
+ARTICLE_REF = View(Article, {
+    'id': Column(),
+    'title': Column(),
+    'category': Pluck(CATEGORY_NAME, 'name'),
+})
+ARTICLE_REF_DATED = View(Article, {
+    'id': Column(),
+    'title': Column(),
+    'category': Pluck(CATEGORY_NAME, 'name'),
+    'created_at': Column(),
+})
+
+# POST /articles and PUT /articles/<id> responses; the routes add the
+# tags they just wrote, dumped with TAG_REF
+ARTICLE_CREATED = View(Article, {
+    'id': Column(),
+    'title': Column(),
+    'author_id': Column(),
+    'category_id': Column(),
+})
+ARTICLE_UPDATED = View(Article, {
+    'id': Column(),
+    'title': Column(),
+    'content': Column(),
+    'category_id': Column(),
+    'updated_at': Column(),
+})
+
+# --- Feedback ---
+
+# GET /articles/<id>/feedback
+FEEDBACK_BY_ARTICLE = View(Feedback, {
+    'id': Column(),
+    'helpfulness_score': Column(),
+    'comment': Column(),
+    'created_at': Column(),
+    'is_anonymous': Method(lambda entry: entry.user_id is None, columns=('user_id',)),
+    'user': Nested(USER_REF, omit_none=True),
+})
+
+# GET /users/<id>/feedback
+FEEDBACK_BY_USER = View(Feedback, {
+    'id': Column(),
+    'article': Nested(ARTICLE_REF),
+    'helpfulness_score': Column(),
+    'comment': Column(),
+    'created_at': Column(),
+})
+
+# --- Users ---
+
+# GET /users (the route adds article_count)
+USER_LIST = View(User, {
+    'id': Column(),
+    'username': Column(),
+    'email': Column(),
+    'role': Column(),
+    'created_at': Column(),
+})
+
+# GET /users/<id>
+USER_DETAIL = View(User, {
+    'id': Column(),
+    'username': Column(),
+    'email': Column(),
+    'role': Column(),
+    'created_at': Column(),
+    'articles': Nested(ARTICLE_REF_DATED),
+})
@@ -0,0 +1,101 @@
+# app/streaming.py
+# Streaming JSON responses for large, unpaginated result sets.
+#
+# Rows come from a server-side cursor (yield_per) and are encoded one at a
+# time into ~64 KB chunks, so a worker only ever holds one batch of rows and
+# one chunk of output instead of the ORM objects, dicts and encoded string
+# for the whole result set.
+#
+# Queries are executed in the view, before the response starts, so database
+# errors still become an error response instead of a truncated 200 and the
+# statement counts towards the request's metrics. They run on a session of
+# their own: the request's scoped session is removed as soon as the view
+# returns, before the body is read.
+from flask import Response, current_app, stream_with_context
+
+from app import db
+
+CHUNK_BYTES = 64 * 1024
+YIELD_PER = 500
+
+
+def streaming_session():
+    """A session for rows read while a response streams; close it when done."""
+    return db.session.session_factory()
+
+
+def execute_streaming(statement, yield_per=YIELD_PER):
+    """Execute `statement` now; returns an iterator over its rows.
+
+    Rows are fetched `yield_per` at a time from a server-side cursor on a
+    streaming_session(), which is closed once the rows are exhausted.
+    """
+    session = streaming_session()
+    try:
+        result = session.execute(statement.execution_options(yield_per=yield_per))
+    except Exception:
+        session.close()
+        raise
+    return closing_rows(result, session)
+
+
+def closing_rows(rows, session):
+    try:
+        yield from rows
+    finally:
+        session.close()
+
+
+def buffered(parts):
+    """Join small string parts into chunks of roughly CHUNK_BYTES."""
+    buffer = []
+    size = 0
+    for part in parts:
+        buffer.append(part)
+        size += len(part)
+        if size >= CHUNK_BYTES:
+            yield ''.join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield ''.join(buffer)
+
+
+def json_array_parts(rows, serialize):
+    dumps = current_app.json.dumps
+    yield '['
+    for index, row in enumerate(rows):
+        if index:
+            yield ','
+        yield dumps(serialize(row))
+    yield ']'
+
+
+def ndjson_parts(items):
+    dumps = current_app.json.dumps
+    for item in items:
+        yield dumps(item) + '\n'
+
+
+def stream_json_array(rows, serialize):
+    """Response whose body is a JSON array of serialize(row) for each row.
+
+    Pass rows from execute_streaming(), so database errors surface before
+    the 200 status is sent.
+    """
+    return Response(
+        stream_with_context(buffered(json_array_parts(rows, serialize))),
+        mimetype='application/json'
+    )
+
+
+def stream_ndjson(items, filename=None):
+    """Response streaming one JSON document per line."""
+    headers = {}
+    if filename:
+        headers['Content-Disposition'] = f'attachment; filename={filename}'
+    return Response(
+        stream_with_context(buffered(ndjson_parts(items))),
+        mimetype='application/x-ndjson',
+        headers=headers
+    )
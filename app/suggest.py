@@ -0,0 +1,190 @@
+# app/suggest.py
+# Typeahead suggestions over tag names, category names and article titles.
+#
+# Backends:
+#   memory   - (default) per-worker sorted prefix index, built lazily on first
+#              use from three narrow SELECTs. Writes in this worker update it
+#              in place; it is rebuilt every SUGGEST_REFRESH_SECONDS so writes
+#              made by other workers show up too. Builds run on a background
+#              thread, one at a time: requests keep reading the previous index
+#              meanwhile, or the database backend before the first build.
+#   database - prefix range scans on the lower(...) expression indexes, for
+#              deployments that need every worker to agree immediately.
+# Matching is on the start of the whole name or title, case-insensitively.
+import threading
+import time
+from bisect import bisect_left, insort
+
+from flask import current_app
+
+from app import db
+from app.models import Article, Category, Tag
+
+DEFAULT_LIMIT = 5
+MAX_LIMIT = 20
+
+# kind -> (model, text column, response field)
+SOURCES = {
+    'tags': (Tag, Tag.name, 'name'),
+    'categories': (Category, Category.name, 'name'),
+    'articles': (Article, Article.title, 'title'),
+}
+
+
+class PrefixIndex:
+    """Sorted (lowercased text, id, text) entries of one kind."""
+
+    def __init__(self, rows):
+        self.entries = sorted((text.lower(), id_, text) for id_, text in rows)
+        self.by_id = {entry[1]: entry for entry in self.entries}
+
+    def search(self, prefix, limit):
+        entries = self.entries
+        start = bisect_left(entries, (prefix,))
+        matches = []
+        for index in range(start, min(start + limit, len(entries))):
+            key, id_, text = entries[index]
+            if not key.startswith(prefix):
+                break
+            matches.append((id_, text))
+        return matches
+
+    def put(self, id_, text):
+        self.discard(id_)
+        entry = (text.lower(), id_, text)
+        insort(self.entries, entry)
+        self.by_id[id_] = entry
+
+    def discard(self, id_):
+        entry = self.by_id.pop(id_, None)
+        if entry is not None:
+            del self.entries[bisect_left(self.entries, entry)]
+
+
+def suggestions():
+    """The current app's Suggestions extension."""
+    return current_app.extensions['suggestions']
+
+
+def prefix_filter(column, prefix):
+    """Index-friendly case-insensitive `startswith` on `column`."""
+    lowered = db.func.lower(column)
+    if db.session.get_bind().dialect.name == 'sqlite':
+        # SQLite only uses the expression index for range comparisons
+        return db.and_(lowered >= prefix, lowered < prefix + '\uffff')
+    escaped = prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return lowered.like(escaped + '%', escape='\\')
+
+
+def database_search(prefix, limit):
+    results = {}
+    for kind, (model, column, _) in SOURCES.items():
+        results[kind] = db.session.execute(
+            db.select(model.id, column)
+            .where(prefix_filter(column, prefix))
+            .order_by(db.func.lower(column), model.id)
+            .limit(limit)
+        ).all()
+    return results
+
+
+class Suggestions:
+    """Flask extension serving prefix suggestions from the configured backend."""
+
+    def __init__(self):
+        self.backend = 'memory'
+        self.refresh_seconds = 300
+        self.indexes = None
+        self.loaded_at = 0
+        self.background_build = True
+        self.load_lock = threading.Lock()
+        self.write_lock = threading.Lock()
+        self.pending = None  # writes made while a build reads the tables
+
+    def init_app(self, app):
+        self.backend = app.config.get('SUGGEST_BACKEND', 'memory')
+        self.refresh_seconds = app.config.get('SUGGEST_REFRESH_SECONDS', self.refresh_seconds)
+        self.background_build = app.config.get('SUGGEST_BACKGROUND_BUILD', self.background_build)
+        app.extensions['suggestions'] = self
+
+    def search(self, prefix, limit=DEFAULT_LIMIT):
+        """{kind: [(id, text), ...]} for entries starting with `prefix`."""
+        prefix = prefix.lower()
+        indexes = self.current() if self.backend == 'memory' else None
+        if indexes is None:
+            return database_search(prefix, limit)
+        with self.write_lock:
+            return {kind: index.search(prefix, limit) for kind, index in indexes.items()}
+
+    def current(self):
+        """The memory indexes, starting a (re)build when missing or due for a refresh.
+
+        Never waits for a build: returns the previous indexes, or None
+        (database fallback) before the first build finishes.
+        """
+        due = time.monotonic() - self.loaded_at > self.refresh_seconds
+        if (self.indexes is None or due) and self.load_lock.acquire(blocking=False):
+            if self.background_build:
+                app = current_app._get_current_object()
+                threading.Thread(target=self.build, args=(app,), name='suggest-build', daemon=True).start()
+            else:
+                try:
+                    self.load()
+                finally:
+                    self.load_lock.release()
+        return self.indexes
+
+    def build(self, app):
+        """Thread body for a background build; the caller holds load_lock."""
+        try:
+            with app.app_context():
+                self.load()
+        except Exception:
+            app.logger.exception('Building the suggestion index failed')
+        finally:
+            self.load_lock.release()
+
+    def load(self):
+        with self.write_lock:
+            self.pending = []
+        loaded_at = time.monotonic()
+        try:
+            indexes = {
+                kind: PrefixIndex(db.session.execute(db.select(model.id, column)).all())
+                for kind, (model, column, _) in SOURCES.items()
+            }
+            with self.write_lock:
+                # Replay writes the SELECTs may have missed
+                for method, kind, args in self.pending:
+                    getattr(indexes[kind], method)(*args)
+                self.indexes = indexes
+                self.loaded_at = loaded_at
+        finally:
+            with self.write_lock:
+                self.pending = None
+
+    def put(self, kind, id_, text):
+        """Add or rename an entry after a committed write."""
+        self.apply('put', kind, id_, text)
+
+    def discard(self, kind, id_):
+        self.apply('discard', kind, id_)
+
+    def apply(self, method, kind, *args):
+        with self.write_lock:
+            if self.pending is not None:
+                self.pending.append((method, kind, args))
+            if self.indexes is not None:
+                getattr(self.indexes[kind], method)(*args)
+
+    def expire(self):
+        """Rebuild on next use, e.g. after a bulk import."""
+        self.loaded_at = 0
+
+    def stats(self):
+        return {
+            'backend': self.backend,
+            'loaded': self.indexes is not None,
+            'entries': {kind: len(index.entries) for kind, index in (self.indexes or {}).items()},
+            'age_seconds': round(time.monotonic() - self.loaded_at, 1) if self.indexes else None
+        }
@@ -51,6 +51,29 @@ def get_metadata():
     return target_db.metadata
 
 
+# Full-text search objects created with raw DDL (app/search.py); the models
+# do not declare them, so autogenerate would otherwise try to drop them
+SEARCH_TABLE_PREFIX = 'articles_fts'
+SEARCH_COLUMNS = {('articles', 'search_vector')}
+SEARCH_INDEXES = {'ix_articles_search_vector'}
+
+# Model indexes declared with .ddl_if(dialect='postgresql'); other databases
+# never get them, so they are only compared on PostgreSQL
+POSTGRESQL_ONLY_INDEXES = {'ix_users_username_pattern'}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    if type_ == 'table' and name.startswith(SEARCH_TABLE_PREFIX):
+        return False
+    if type_ == 'column' and (object.table.name, name) in SEARCH_COLUMNS:
+        return False
+    if type_ == 'index' and name in SEARCH_INDEXES:
+        return False
+    if type_ == 'index' and name in POSTGRESQL_ONLY_INDEXES:
+        return context.get_context().dialect.name == 'postgresql'
+    return True
+
+
 def run_migrations_offline():
     """Run migrations in 'offline' mode.
 
@@ -65,7 +88,8 @@ def run_migrations_offline():
     """
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
-        url=url, target_metadata=get_metadata(), literal_binds=True
+        url=url, target_metadata=get_metadata(), literal_binds=True,
+        include_object=include_object
     )
 
     with context.begin_transaction():
@@ -93,6 +117,7 @@ def run_migrations_online():
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    conf_args.setdefault("include_object", include_object)
 
     connectable = get_engine()
 
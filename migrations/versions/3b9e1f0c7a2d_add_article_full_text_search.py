@@ -0,0 +1,78 @@
+"""add article full-text search
+
+Revision ID: 3b9e1f0c7a2d
+Revises: daefc04a582a
+Create Date: 2026-10-18 09:12:41.201934
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '3b9e1f0c7a2d'
+down_revision = 'daefc04a582a'
+branch_labels = None
+depends_on = None
+
+# The schema as of this revision; kept here rather than imported from
+# app.search so later changes to the app cannot rewrite this migration
+SQLITE_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5("
+    "title, content, content='articles', content_rowid='id', "
+    "tokenize='porter unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS articles_fts_ai AFTER INSERT ON articles BEGIN "
+    "INSERT INTO articles_fts(rowid, title, content) "
+    "VALUES (new.id, new.title, new.content); END",
+    "CREATE TRIGGER IF NOT EXISTS articles_fts_ad AFTER DELETE ON articles BEGIN "
+    "INSERT INTO articles_fts(articles_fts, rowid, title, content) "
+    "VALUES ('delete', old.id, old.title, old.content); END",
+    "CREATE TRIGGER IF NOT EXISTS articles_fts_au AFTER UPDATE OF title, content ON articles BEGIN "
+    "INSERT INTO articles_fts(articles_fts, rowid, title, content) "
+    "VALUES ('delete', old.id, old.title, old.content); "
+    "INSERT INTO articles_fts(rowid, title, content) "
+    "VALUES (new.id, new.title, new.content); END",
+    "INSERT INTO articles_fts(articles_fts) VALUES ('rebuild')",
+]
+
+SQLITE_DROP_DDL = [
+    "DROP TABLE IF EXISTS articles_fts",
+]
+
+POSTGRES_DDL = [
+    "ALTER TABLE articles ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    "GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(content, '')), 'B')"
+    ") STORED",
+    "CREATE INDEX IF NOT EXISTS ix_articles_search_vector "
+    "ON articles USING GIN (search_vector)",
+]
+
+POSTGRES_DROP_DDL = [
+    "DROP INDEX IF EXISTS ix_articles_search_vector",
+    "ALTER TABLE articles DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        # Creates the FTS5 table and triggers, then indexes existing rows
+        for statement in SQLITE_DDL:
+            op.execute(statement)
+    elif dialect == 'postgresql':
+        # Generated column is computed for existing rows on creation
+        for statement in POSTGRES_DDL:
+            op.execute(statement)
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        for trigger in ('articles_fts_ai', 'articles_fts_ad', 'articles_fts_au'):
+            op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+        for statement in SQLITE_DROP_DDL:
+            op.execute(statement)
+    elif dialect == 'postgresql':
+        for statement in POSTGRES_DROP_DDL:
+            op.execute(statement)
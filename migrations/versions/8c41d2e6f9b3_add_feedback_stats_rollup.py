@@ -0,0 +1,51 @@
+"""add feedback stats rollup
+
+Revision ID: 8c41d2e6f9b3
+Revises: 3b9e1f0c7a2d
+Create Date: 2026-10-18 10:03:27.558112
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c41d2e6f9b3'
+down_revision = '3b9e1f0c7a2d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('feedback_stats',
+    sa.Column('article_id', sa.Integer(), nullable=False),
+    sa.Column('feedback_count', sa.Integer(), nullable=False),
+    sa.Column('score_sum', sa.Integer(), nullable=False),
+    sa.Column('score_1', sa.Integer(), nullable=False),
+    sa.Column('score_2', sa.Integer(), nullable=False),
+    sa.Column('score_3', sa.Integer(), nullable=False),
+    sa.Column('score_4', sa.Integer(), nullable=False),
+    sa.Column('score_5', sa.Integer(), nullable=False),
+    sa.Column('last_feedback_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['article_id'], ['articles.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('article_id')
+    )
+
+    # Backfill from existing feedback; `flask feedback rebuild-stats` does the
+    # same in batches if the rollup ever needs repairing
+    op.execute(
+        "INSERT INTO feedback_stats (article_id, feedback_count, score_sum, "
+        "score_1, score_2, score_3, score_4, score_5, last_feedback_at) "
+        "SELECT article_id, COUNT(*), SUM(helpfulness_score), "
+        "SUM(CASE WHEN helpfulness_score = 1 THEN 1 ELSE 0 END), "
+        "SUM(CASE WHEN helpfulness_score = 2 THEN 1 ELSE 0 END), "
+        "SUM(CASE WHEN helpfulness_score = 3 THEN 1 ELSE 0 END), "
+        "SUM(CASE WHEN helpfulness_score = 4 THEN 1 ELSE 0 END), "
+        "SUM(CASE WHEN helpfulness_score = 5 THEN 1 ELSE 0 END), "
+        "MAX(created_at) "
+        "FROM feedback GROUP BY article_id"
+    )
+
+
+def downgrade():
+    op.drop_table('feedback_stats')
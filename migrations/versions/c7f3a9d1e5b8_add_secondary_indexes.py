@@ -0,0 +1,38 @@
+"""add secondary indexes
+
+Revision ID: c7f3a9d1e5b8
+Revises: 8c41d2e6f9b3
+Create Date: 2026-10-18 11:20:54.730186
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7f3a9d1e5b8'
+down_revision = '8c41d2e6f9b3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_articles_created_at_id', 'articles', [sa.text('created_at DESC'), sa.text('id DESC')])
+    op.create_index('ix_articles_category_created_at', 'articles', ['category_id', sa.text('created_at DESC')])
+    op.create_index('ix_articles_author_created_at', 'articles', ['author_id', sa.text('created_at DESC')])
+    op.create_index('ix_articles_updated_at', 'articles', ['updated_at'])
+    op.create_index('ix_article_tags_tag_article', 'article_tags', ['tag_id', 'article_id'])
+    op.create_index('ix_feedback_article_score', 'feedback', ['article_id', 'helpfulness_score'])
+    op.create_index('ix_feedback_article_created_at', 'feedback', ['article_id', sa.text('created_at DESC')])
+    op.create_index('ix_feedback_user_created_at', 'feedback', ['user_id', sa.text('created_at DESC')])
+
+
+def downgrade():
+    op.drop_index('ix_feedback_user_created_at', table_name='feedback')
+    op.drop_index('ix_feedback_article_created_at', table_name='feedback')
+    op.drop_index('ix_feedback_article_score', table_name='feedback')
+    op.drop_index('ix_article_tags_tag_article', table_name='article_tags')
+    op.drop_index('ix_articles_updated_at', table_name='articles')
+    op.drop_index('ix_articles_author_created_at', table_name='articles')
+    op.drop_index('ix_articles_category_created_at', table_name='articles')
+    op.drop_index('ix_articles_created_at_id', table_name='articles')
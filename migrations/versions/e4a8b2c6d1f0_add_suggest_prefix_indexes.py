@@ -0,0 +1,30 @@
+"""add suggest prefix indexes
+
+Revision ID: e4a8b2c6d1f0
+Revises: c7f3a9d1e5b8
+Create Date: 2026-10-18 13:02:17.448310
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4a8b2c6d1f0'
+down_revision = 'c7f3a9d1e5b8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # text_pattern_ops lets PostgreSQL serve LIKE 'prefix%' from the index
+    ops = ' text_pattern_ops' if op.get_bind().dialect.name == 'postgresql' else ''
+    op.create_index('ix_tags_name_lower', 'tags', [sa.text(f'lower(name){ops}')])
+    op.create_index('ix_categories_name_lower', 'categories', [sa.text(f'lower(name){ops}')])
+    op.create_index('ix_articles_title_lower', 'articles', [sa.text(f'lower(title){ops}')])
+
+
+def downgrade():
+    op.drop_index('ix_articles_title_lower', table_name='articles')
+    op.drop_index('ix_categories_name_lower', table_name='categories')
+    op.drop_index('ix_tags_name_lower', table_name='tags')
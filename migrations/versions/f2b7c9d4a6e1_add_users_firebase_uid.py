@@ -0,0 +1,35 @@
+"""add users firebase_uid
+
+Revision ID: f2b7c9d4a6e1
+Revises: e4a8b2c6d1f0
+Create Date: 2026-10-18 15:41:09.218734
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2b7c9d4a6e1'
+down_revision = 'e4a8b2c6d1f0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Databases built with db.create_all() may already have the column
+    columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('users')}
+    if 'firebase_uid' not in columns:
+        op.add_column('users', sa.Column('firebase_uid', sa.String(length=128), nullable=True))
+    op.create_index('ix_users_firebase_uid', 'users', ['firebase_uid'], unique=True)
+    if op.get_bind().dialect.name == 'postgresql':
+        op.create_index('ix_users_username_pattern', 'users',
+                        [sa.text('username text_pattern_ops')])
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('ix_users_username_pattern', table_name='users')
+    op.drop_index('ix_users_firebase_uid', table_name='users')
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('firebase_uid')
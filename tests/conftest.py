@@ -0,0 +1,18 @@
+# tests/conftest.py
+# Shared fixtures: an app on the `testing` profile (in-memory SQLite,
+# response cache off) holding a small generated dataset.
+import pytest
+
+from app import create_app, db
+from app.datagen import generate_dataset
+
+
+@pytest.fixture(scope='module')
+def app():
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        generate_dataset(60, users=10, categories=5, tags=20, batch_size=100)
+        db.session.remove()
+        yield app
+        db.drop_all()
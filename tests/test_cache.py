@@ -0,0 +1,221 @@
+# tests/test_cache.py
+# Response cache backends and route invalidation.
+#
+# RedisBackend runs against FakeRedis, a dict-backed stand-in for the few
+# client calls it makes. Both backends read the same fake clock so TTLs can
+# be checked without sleeping.
+import importlib
+from types import SimpleNamespace
+
+import pytest
+
+from app import cache, db
+from app.cache import MemoryBackend, RedisBackend
+from app.models import Article
+
+# `app.cache` on the package is the ResponseCache instance, not the module
+cache_module = importlib.import_module('app.cache')
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeRedis:
+    """The subset of redis.Redis that RedisBackend uses; values come back as bytes."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.data = {}     # key -> value (bytes or set of bytes)
+        self.expires = {}  # key -> expiry time
+
+    def _live(self, key):
+        if key in self.expires and self.expires[key] <= self.clock():
+            self.data.pop(key, None)
+            del self.expires[key]
+        return key in self.data
+
+    def get(self, key):
+        return self.data[key] if self._live(key) else None
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value.encode() if isinstance(value, str) else value
+        self.expires.pop(key, None)
+        if ex is not None:
+            self.expires[key] = self.clock() + ex
+        return True
+
+    def delete(self, *keys):
+        removed = 0
+        for key in keys:
+            if self._live(key):
+                del self.data[key]
+                self.expires.pop(key, None)
+                removed += 1
+        return removed
+
+    def sadd(self, key, *members):
+        members = {m.encode() if isinstance(m, str) else m for m in members}
+        self._live(key)  # drops an expired set first
+        existing = self.data.setdefault(key, set())
+        added = len(members - existing)
+        existing.update(members)
+        return added
+
+    def smembers(self, key):
+        return set(self.data[key]) if self._live(key) else set()
+
+    def expire(self, key, seconds):
+        if not self._live(key):
+            return False
+        self.expires[key] = self.clock() + seconds
+        return True
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module, 'time', SimpleNamespace(monotonic=clock))
+    return clock
+
+
+@pytest.fixture(params=['memory', 'redis'])
+def backend(request, clock):
+    if request.param == 'memory':
+        return MemoryBackend(max_entries=3)
+    return RedisBackend(FakeRedis(clock))
+
+
+def test_round_trip_and_counters(backend):
+    assert backend.get('/articles') is None
+    backend.set('/articles', {'status': 200, 'body': 'x'}, 60, tags=('articles',))
+    assert backend.get('/articles') == {'status': 200, 'body': 'x'}
+    assert backend.get('/articles') == {'status': 200, 'body': 'x'}
+
+    stats = backend.stats()
+    assert (stats['hits'], stats['misses']) == (2, 1)
+
+
+def test_entries_expire_after_ttl(backend, clock):
+    backend.set('/articles/1', 'one', 10, tags=('article:1',))
+    clock.now += 9
+    assert backend.get('/articles/1') == 'one'
+    clock.now += 2
+    assert backend.get('/articles/1') is None
+
+
+def test_invalidate_drops_only_tagged_entries(backend):
+    backend.set('/articles/1', 'one', 60, tags=('articles', 'article:1'))
+    backend.set('/articles/2', 'two', 60, tags=('articles', 'article:2'))
+    backend.set('/tags', 'tags', 60, tags=('tags',))
+
+    backend.invalidate(['article:1'])
+    assert backend.get('/articles/1') is None
+    assert backend.get('/articles/2') == 'two'
+
+    backend.invalidate(['articles'])
+    assert backend.get('/articles/2') is None
+    assert backend.get('/tags') == 'tags'
+
+
+def test_redis_invalidate_removes_tag_set(clock):
+    client = FakeRedis(clock)
+    backend = RedisBackend(client)
+    backend.set('/articles/1', 'one', 60, tags=('article:1',))
+    assert client.smembers('kb:cache:tag:article:1') == {b'/articles/1'}
+
+    backend.invalidate(['article:1'])
+    assert client.data == {}
+
+
+def test_redis_tag_set_outlives_its_entries(clock):
+    client = FakeRedis(clock)
+    backend = RedisBackend(client)
+    backend.set('/articles/1', 'one', 10, tags=('articles',))
+    backend.set('/articles', 'list', 60, tags=('articles',))
+
+    clock.now += 30
+    assert client.smembers('kb:cache:tag:articles') == {b'/articles/1', b'/articles'}
+    backend.invalidate(['articles'])
+    assert backend.get('/articles') is None
+
+
+def test_memory_evicts_least_recently_used(clock):
+    backend = MemoryBackend(max_entries=2)
+    backend.set('a', 1, 60, tags=('t',))
+    backend.set('b', 2, 60, tags=('t',))
+    backend.get('a')  # b is now the oldest
+    backend.set('c', 3, 60)
+
+    assert backend.get('b') is None
+    assert backend.get('a') == 1
+    assert backend.get('c') == 3
+    assert backend.stats()['evictions'] == 1
+    assert backend.stats()['entries'] == 2
+    # The evicted key is gone from the tag index too
+    assert backend.tag_index['t'] == {'a'}
+
+
+def test_redis_leaves_eviction_to_the_server(clock):
+    assert RedisBackend(FakeRedis(clock)).stats()['evictions'] == 0
+
+
+@pytest.fixture(params=['memory', 'redis'])
+def client(request, app):
+    if request.param == 'memory':
+        backend = MemoryBackend()
+    else:
+        backend = RedisBackend(FakeRedis(Clock()))
+    cache.init_app(app, backend)
+    cache.enabled = True
+    with app.app_context():
+        yield app.test_client()
+    cache.init_app(app)  # back to the testing profile: cache off
+
+
+def get(client, url):
+    db.session.remove()
+    return client.get(url)
+
+
+def assert_write_misses(client, url, method, write_url, body):
+    assert get(client, url).headers['X-Cache'] == 'MISS'
+    assert get(client, url).headers['X-Cache'] == 'HIT'
+
+    db.session.remove()
+    response = client.open(write_url, method=method, json=body)
+    assert response.status_code in (200, 201)
+
+    response = get(client, url)
+    assert response.status_code == 200
+    assert response.headers['X-Cache'] == 'MISS'
+
+
+@pytest.mark.parametrize('url, method, write_url, body', [
+    ('/articles/1', 'PUT', '/articles/1', {'title': 'Cache check'}),
+    ('/articles/1/feedback/summary', 'POST', '/articles/1/feedback', {'helpfulness_score': 5}),
+    ('/articles?per_page=5', 'POST', '/articles', {
+        'title': 'Cache check', 'content': 'New article', 'author_id': 1, 'category_id': 1,
+    }),
+])
+def test_write_makes_next_get_miss(client, url, method, write_url, body):
+    assert_write_misses(client, url, method, write_url, body)
+
+
+def test_author_rename_makes_article_miss(client):
+    article_id = db.session.scalar(db.select(Article.id).filter_by(author_id=1).limit(1))
+    assert_write_misses(client, f'/articles/{article_id}', 'PUT', '/users/1', {'username': 'cache-check'})
+
+
+def test_feedback_on_listed_article_makes_related_miss(client):
+    related = get(client, '/articles/1/related').get_json()['related']
+    assert get(client, '/articles/1/related').headers['X-Cache'] == 'HIT'
+
+    db.session.remove()
+    response = client.post(f"/articles/{related[0]['id']}/feedback", json={'helpfulness_score': 1})
+    assert response.status_code == 201
+    assert get(client, '/articles/1/related').headers['X-Cache'] == 'MISS'
@@ -0,0 +1,49 @@
+# tests/test_feedback_stats.py
+# The feedback_stats rollup row tracks writes to the feedback table.
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import db
+from app.feedback_stats import record_feedback
+from app.models import Article, Feedback, FeedbackStats
+
+
+@pytest.fixture
+def client(app):
+    with app.app_context():
+        yield app.test_client()
+
+
+def add_feedback(article_id, score, created_at):
+    feedback = Feedback(article_id=article_id, helpfulness_score=score, created_at=created_at)
+    db.session.add(feedback)
+    db.session.flush()
+    record_feedback(article_id, score, created_at)
+    return feedback.id
+
+
+def test_deleting_newest_feedback_rolls_back_last_feedback_at(client):
+    article = Article(title='Rollup', content='Rollup check', author_id=1, category_id=1)
+    db.session.add(article)
+    db.session.flush()
+    older = datetime(2024, 1, 1, 12, 0)
+    newer = older + timedelta(hours=1)
+    older_id = add_feedback(article.id, 2, older)
+    newer_id = add_feedback(article.id, 5, newer)
+    db.session.commit()
+    article_id = article.id
+
+    db.session.remove()
+    assert client.delete(f'/feedback/{newer_id}').status_code == 200
+    db.session.remove()
+    stats = db.session.get(FeedbackStats, article_id)
+    assert stats.last_feedback_at == older
+    assert (stats.feedback_count, stats.score_sum, stats.score_2, stats.score_5) == (1, 2, 1, 0)
+
+    db.session.remove()
+    assert client.delete(f'/feedback/{older_id}').status_code == 200
+    db.session.remove()
+    stats = db.session.get(FeedbackStats, article_id)
+    assert stats.last_feedback_at is None
+    assert stats.feedback_count == 0
@@ -0,0 +1,103 @@
+# tests/test_query_budgets.py
+# SQL statement budgets per endpoint.
+#
+# Listing routes are checked at two page sizes: a budget that only holds
+# for the small page means some relationship is loaded once per row again.
+# Raising a budget should come with a reason in the commit that does it.
+import pytest
+
+from app import db
+from app.queries import count_statements
+
+PAGE_SIZES = (5, 50)
+
+# (url, statements); {per_page} is filled in from PAGE_SIZES. GET /articles
+# and /articles/<id> include one validator query (app/conditional.py)
+READ_BUDGETS = [
+    ('/articles?per_page={per_page}', 4),
+    ('/articles?cursor=&per_page={per_page}', 3),
+    ('/articles?category_id=1&per_page={per_page}', 4),
+    ('/articles?author_id=1&per_page={per_page}', 4),
+    ('/articles?tag_id=1&per_page={per_page}', 4),
+    ('/articles?search=api&per_page={per_page}', 5),
+    ('/articles?fields=id,title&per_page={per_page}', 3),
+    ('/articles/1', 3),
+    ('/articles/tag/tag-0?per_page={per_page}', 3),
+    ('/articles/1/related', 4),
+    ('/articles/export', 2),
+    ('/articles/1/feedback?per_page={per_page}', 4),
+    ('/articles/1/feedback/summary', 1),
+    ('/feedback/summary?article_ids=1,2,3', 1),
+    ('/users', 1),
+    ('/users/1', 2),
+    ('/users/1/feedback?per_page={per_page}', 3),
+    ('/categories', 1),
+    ('/tags', 1),
+    # First call builds this worker's prefix index
+    ('/suggest?q=tag', 3),
+]
+
+
+def run(client, method, url, json=None, headers=None):
+    """Make one request with a fresh session; returns (response, statement count)."""
+    # Requests share the test's app context; give each the empty session
+    # a real request starts with
+    db.session.remove()
+    with count_statements() as statements:
+        response = client.open(url, method=method, json=json, headers=headers)
+        response.get_data()  # drains streamed bodies
+    return response, len(statements)
+
+
+@pytest.fixture
+def client(app):
+    with app.app_context():
+        yield app.test_client()
+
+
+@pytest.mark.parametrize('url, budget', READ_BUDGETS)
+def test_read_budget(client, url, budget):
+    for per_page in PAGE_SIZES:
+        response, statements = run(client, 'GET', url.format(per_page=per_page))
+        assert response.status_code == 200
+        assert statements <= budget, f'{url} (per_page={per_page}): {statements} statements'
+
+
+def test_write_budgets(client):
+    response, statements = run(client, 'POST', '/articles', {
+        'title': 'Budget', 'content': 'Statement budget check',
+        'author_id': 1, 'category_id': 1, 'tag_ids': [1, 2, 3],
+    })
+    assert response.status_code == 201
+    assert statements <= 6
+    article_id = response.get_json()['article']['id']
+
+    response, statements = run(client, 'PUT', f'/articles/{article_id}', {'title': 'Edited', 'tag_ids': [2, 4]})
+    assert response.status_code == 200
+    assert statements <= 7
+
+    response, statements = run(client, 'POST', f'/articles/{article_id}/feedback',
+                               {'helpfulness_score': 4, 'user_id': 1})
+    assert response.status_code == 201
+    assert statements <= 5
+
+    response, statements = run(client, 'DELETE', f"/feedback/{response.get_json()['feedback_id']}")
+    assert response.status_code == 200
+    assert statements <= 3
+
+    response, statements = run(client, 'DELETE', f'/articles/{article_id}')
+    assert response.status_code == 200
+    assert statements <= 11
+
+
+def test_login_budget(client):
+    response, statements = run(client, 'POST', '/login', {'username': 'user0000000', 'password': 'password'})
+    assert response.status_code == 200
+    assert statements <= 1
+
+
+def test_not_modified_skips_the_view(client):
+    response, _ = run(client, 'GET', '/articles/1')
+    response, statements = run(client, 'GET', '/articles/1', headers={'If-None-Match': response.headers['ETag']})
+    assert response.status_code == 304
+    assert statements == 1  # the validator only
@@ -0,0 +1,16 @@
+# tests/test_query_plans.py
+# Every SELECT issued by the read routes must reach the large tables
+# through an index (see app/plans.py; `flask perf explain` runs the same
+# check against a real database).
+from app.plans import explain_routes, route_values
+
+
+def test_read_routes_avoid_full_scans(app):
+    with app.app_context():
+        values = route_values()
+        assert values is not None
+        plans = list(explain_routes(values))
+
+    assert plans
+    failures = [f"{plan.url}: {', '.join(sorted(plan.scans))}" for plan in plans if plan.scans]
+    assert not failures, 'Full table scans:\n' + '\n'.join(failures)
@@ -0,0 +1,52 @@
+# tests/test_suggest.py
+# Building the per-worker suggestion index without blocking readers or losing writes.
+import threading
+
+from app import suggest
+from app.suggest import PrefixIndex, Suggestions
+
+
+def indexes(title):
+    return {kind: PrefixIndex([(1, title)]) for kind in suggest.SOURCES}
+
+
+def test_background_build_serves_previous_index(app, monkeypatch):
+    suggestions = Suggestions()
+    stale, fresh = indexes('Stale'), indexes('Fresh')
+    suggestions.indexes = stale  # loaded_at 0: due for a refresh
+    started, release = threading.Event(), threading.Event()
+    builds = []
+
+    def slow_load():
+        builds.append(threading.current_thread().name)
+        started.set()
+        release.wait(5)
+        suggestions.indexes, suggestions.loaded_at = fresh, suggest.time.monotonic()
+
+    monkeypatch.setattr(suggestions, 'load', slow_load)
+    with app.app_context():
+        assert suggestions.current() is stale
+        assert started.wait(5)
+        assert suggestions.current() is stale  # no second build while one runs
+        release.set()
+        with suggestions.load_lock:  # released when the build finishes
+            pass
+        assert suggestions.current() is fresh
+    assert builds == ['suggest-build']
+
+
+def test_writes_during_build_are_kept(app, monkeypatch):
+    suggestions = Suggestions()
+    suggestions.background_build = False
+
+    class RacingIndex(PrefixIndex):
+        # An article saved while the build is reading the tables
+        def __init__(self, rows):
+            super().__init__(rows)
+            suggestions.put('articles', 999999, 'Written mid-build')
+
+    monkeypatch.setattr(suggest, 'PrefixIndex', RacingIndex)
+    with app.app_context():
+        built = suggestions.current()
+    assert built['articles'].search('written mid', 5) == [(999999, 'Written mid-build')]
+    assert suggestions.pending is None
@@ -1,24 +1,8 @@
 # wsgi.py
-from app import create_app, db
-from app.models import User
+# Entry point for gunicorn. Building the app does no database I/O, so it is
+# safe with --preload; create the schema and seed data with the CLI instead:
+#   flask --app wsgi db upgrade
+#   flask --app wsgi seed
+from app import create_app
 
 app = create_app()
-
-# Auto-create tables on startup
-with app.app_context():
-    try:
-        # Try to query to see if tables exist
-        User.query.first()
-        print("✅ Database tables already exist")
-    except:
-        print("🔄 Creating database tables...")
-        db.create_all()
-        print("✅ Database tables created")
-        
-        # Seed initial data
-        try:
-            from seed import seed_database
-            seed_database()
-            print("✅ Database seeded successfully")
-        except Exception as e:
-            print(f"⚠️  Seeding failed: {e}")
\ No newline at end of file